@@ -0,0 +1,197 @@
+from array import array
+from typing import Any, Generator
+
+from tree_node import TreeNode
+
+# Index used instead of None for a missing child/parent.
+NIL = -1
+
+
+class ArrayBinarySearchTree:
+    """Binary-Search-Tree whose nodes live in parallel arrays (struct of arrays).
+
+    Keys and the left/right/parent links are stored as machine integers in
+    `array` buffers, values in a plain list, so a node costs a few bytes
+    instead of a full Python object. Slots of removed nodes are reused.
+    The interface follows BinarySearchTree; `find` and the traversals hand out
+    detached TreeNode copies of the stored key/value pairs.
+    """
+
+    def __init__(self):
+        self._keys = array('q')
+        self._left = array('q')
+        self._right = array('q')
+        self._parent = array('q')
+        self._values = []
+        self._free = []
+        self._root = NIL
+        self._size = 0
+
+    def _new_slot(self, key: int, value: Any, parent: int) -> int:
+        if self._free:
+            slot = self._free.pop()
+            self._keys[slot] = key
+            self._values[slot] = value
+            self._left[slot] = self._right[slot] = NIL
+            self._parent[slot] = parent
+            return slot
+        self._keys.append(key)
+        self._values.append(value)
+        self._left.append(NIL)
+        self._right.append(NIL)
+        self._parent.append(parent)
+        return len(self._keys) - 1
+
+    def _find_slot(self, key: int) -> int:
+        keys, left, right = self._keys, self._left, self._right
+        slot = self._root
+        while slot != NIL:
+            slot_key = keys[slot]
+            if key < slot_key:
+                slot = left[slot]
+            elif key > slot_key:
+                slot = right[slot]
+            else:
+                return slot
+        return NIL
+
+    def _node(self, slot: int) -> TreeNode:
+        return TreeNode(self._keys[slot], self._values[slot])
+
+    def insert(self, key: int, value: Any) -> None:
+        """Insert a new node into the tree.
+
+        Args:
+            key (int): Key which is used for placing the value into the tree.
+            value (Any): Value to insert.
+
+        Raises:
+            ValueError: If key or value is None.
+            KeyError: If key is already present in the tree.
+        """
+        if key == None or value == None:
+            raise ValueError
+        keys, left, right = self._keys, self._left, self._right
+        parent, slot = NIL, self._root
+        while slot != NIL:
+            parent = slot
+            if key < keys[slot]:
+                slot = left[slot]
+            elif key > keys[slot]:
+                slot = right[slot]
+            else:
+                raise KeyError(f"Key {key} already exists in the tree.")
+        slot = self._new_slot(key, value, parent)
+        if parent == NIL:
+            self._root = slot
+        elif key < keys[parent]:
+            left[parent] = slot
+        else:
+            right[parent] = slot
+        self._size += 1
+
+    def find(self, key: int) -> TreeNode:
+        """Return a detached node holding key and its value.
+
+        Raises:
+            ValueError: If key is None.
+            KeyError: If key is not present in the tree.
+        """
+        if key == None:
+            raise ValueError
+        slot = self._find_slot(key)
+        if slot == NIL:
+            raise KeyError(f"Key {key} not found in the tree.")
+        return self._node(slot)
+
+    def __getitem__(self, key: int) -> Any:
+        if key == None:
+            raise ValueError
+        slot = self._find_slot(key)
+        if slot == NIL:
+            raise KeyError(f"Key {key} not found in the tree.")
+        return self._values[slot]
+
+    def __contains__(self, key: int) -> bool:
+        return key != None and self._find_slot(key) != NIL
+
+    @property
+    def size(self) -> int:
+        """Return number of nodes contained in the tree."""
+        return self._size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _replace_child(self, parent: int, old: int, new: int) -> None:
+        if parent == NIL:
+            self._root = new
+        elif self._left[parent] == old:
+            self._left[parent] = new
+        else:
+            self._right[parent] = new
+        if new != NIL:
+            self._parent[new] = parent
+
+    def remove(self, key: int) -> None:
+        """Remove node with given key, maintaining BST-properties.
+
+        Raises:
+            ValueError: If key is None.
+            KeyError: If key is not present in the tree.
+        """
+        if key == None:
+            raise ValueError
+        slot = self._find_slot(key)
+        if slot == NIL:
+            raise KeyError(f"Key {key} not found in the tree.")
+        left, right, parent = self._left, self._right, self._parent
+
+        if left[slot] != NIL and right[slot] != NIL:
+            # Move the in-order successor into the slot, then unlink the successor.
+            successor = right[slot]
+            while left[successor] != NIL:
+                successor = left[successor]
+            self._keys[slot] = self._keys[successor]
+            self._values[slot] = self._values[successor]
+            slot = successor
+
+        child = left[slot] if left[slot] != NIL else right[slot]
+        self._replace_child(parent[slot], slot, child)
+        self._values[slot] = None
+        self._free.append(slot)
+        self._size -= 1
+
+    def inorder(self) -> Generator[TreeNode, None, None]:
+        """Yield detached nodes in inorder."""
+        left, right = self._left, self._right
+        stack = []
+        slot = self._root
+        while stack or slot != NIL:
+            while slot != NIL:
+                stack.append(slot)
+                slot = left[slot]
+            slot = stack.pop()
+            yield self._node(slot)
+            slot = right[slot]
+
+    def __iter__(self) -> Generator[TreeNode, None, None]:
+        yield from self.inorder()
+
+    @property
+    def is_valid(self) -> bool:
+        """Return if the tree fulfills BST-criteria."""
+        keys, left, right = self._keys, self._left, self._right
+        stack = [(self._root, -float('inf'), float('inf'))]
+        while stack:
+            slot, low, high = stack.pop()
+            if slot == NIL:
+                continue
+            if not (low < keys[slot] < high):
+                return False
+            stack.append((left[slot], low, keys[slot]))
+            stack.append((right[slot], keys[slot], high))
+        return True
+
+    def __repr__(self) -> str:
+        return f"ArrayBinarySearchTree({list(self.inorder())})"
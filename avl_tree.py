@@ -0,0 +1,50 @@
+from bst import BinarySearchTree
+from tree_node import TreeNode
+
+
+class AVLTree(BinarySearchTree):
+    """Self-balancing Binary-Search-Tree (AVL).
+
+    After every insert and remove the heights of the two subtrees of any node
+    differ by at most one, so the height stays O(log n) even for sorted input.
+    The interface is the one of BinarySearchTree.
+    """
+
+    def _balance(self, node: TreeNode) -> int:
+        """Return height(left) - height(right) of node."""
+        return self._height(node.left) - self._height(node.right)
+
+    def _retrace(self, node: TreeNode) -> None:
+        """Walk from node up to the root, rotating wherever a node is out of balance."""
+        while node:
+            self._update(node)
+            balance = self._balance(node)
+            if balance > 1:
+                if self._balance(node.left) < 0:
+                    self._rotate_left(node.left)
+                node = self._rotate_right(node)
+            elif balance < -1:
+                if self._balance(node.right) > 0:
+                    self._rotate_right(node.right)
+                node = self._rotate_left(node)
+            node = node.parent
+
+    @property
+    def is_balanced(self) -> bool:
+        """Return if every node fulfills the AVL-criterion and stores its correct height."""
+        stack = [(self._root, False)]
+        heights = {None: 0}
+        while stack:
+            node, children_done = stack.pop()
+            if node is None:
+                continue
+            if not children_done:
+                stack.append((node, True))
+                stack.append((node.right, False))
+                stack.append((node.left, False))
+                continue
+            left, right = heights[node.left], heights[node.right]
+            if abs(left - right) > 1 or node.height != 1 + max(left, right):
+                return False
+            heights[node] = node.height
+        return True
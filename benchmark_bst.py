@@ -0,0 +1,309 @@
+"""Micro-benchmarks for BinarySearchTree.
+
+Run with `python benchmark_bst.py [num_keys]`.
+"""
+import sys
+import threading
+from random import Random
+import tracemalloc
+from time import perf_counter
+
+from array_bst import ArrayBinarySearchTree
+from avl_tree import AVLTree
+from bst import BinarySearchTree
+from btree import BTree
+from concurrent_bst import ConcurrentBinarySearchTree
+from splay_tree import SplayTree
+from tree_node import TreeNode
+
+
+def recursive_inorder(node):
+    """The former recursive traversal, kept as a reference point."""
+    if node:
+        yield from recursive_inorder(node.left)
+        yield node
+        yield from recursive_inorder(node.right)
+
+
+def degenerate_tree(num_keys: int) -> BinarySearchTree:
+    """Return a tree whose nodes form a right-leaning chain (what sorted inserts produce)."""
+    tree = BinarySearchTree()
+    previous = None
+    for key in range(num_keys):
+        node = TreeNode(key, key, parent=previous)
+        if previous:
+            previous.right = node
+        else:
+            tree._root = node
+        previous = node
+    tree._size = num_keys
+    return tree
+
+
+def time_scan(label: str, nodes, num_keys: int) -> None:
+    start = perf_counter()
+    count = sum(1 for _ in nodes)
+    elapsed = perf_counter() - start
+    assert count == num_keys
+    print(f"{label:<40} {elapsed:8.3f} s  {num_keys / elapsed / 1e6:6.2f} M nodes/s")
+
+
+def bench_traversals(num_keys: int) -> None:
+    """Full-scan throughput of the traversal generators."""
+    balanced = BinarySearchTree.from_sorted((key, key) for key in range(num_keys))
+    print(f"Full scans, balanced tree with {num_keys} nodes")
+    time_scan("recursive inorder (reference)", recursive_inorder(balanced.get_root()), num_keys)
+    time_scan("inorder", balanced.inorder(), num_keys)
+    time_scan("preorder", balanced.preorder(), num_keys)
+    time_scan("postorder", balanced.postorder(), num_keys)
+
+    chain = degenerate_tree(num_keys)
+    print(f"Full scans, degenerate tree with {num_keys} nodes")
+    time_scan("inorder", chain.inorder(), num_keys)
+    time_scan("preorder", chain.preorder(), num_keys)
+    time_scan("postorder", chain.postorder(), num_keys)
+
+
+def bytes_per_key(build, num_keys: int) -> float:
+    """Return the memory tracemalloc attributes to build(num_keys), per key."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tree = build(num_keys)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(tree) == num_keys
+    return (after - before) / num_keys
+
+
+def bench_memory(num_keys: int) -> None:
+    """Node overhead per key. All keys share one value object, so only the structure is measured."""
+    value = object()
+    num_keys = min(num_keys, 200_000)
+    keys = list(range(num_keys))
+    Random(42).shuffle(keys)
+
+    def linked(n):
+        tree = BinarySearchTree()
+        for key in keys:
+            tree.insert(key=key, value=value)
+        return tree
+
+    def packed(n):
+        tree = ArrayBinarySearchTree()
+        for key in keys:
+            tree.insert(key=key, value=value)
+        return tree
+
+    print(f"Memory, {num_keys} keys")
+    print(f"{'BinarySearchTree (TreeNode)':<40} {bytes_per_key(linked, num_keys):8.1f} bytes/key")
+    print(f"{'ArrayBinarySearchTree':<40} {bytes_per_key(packed, num_keys):8.1f} bytes/key")
+
+
+def bench_concurrent(num_keys: int, num_threads: int = 8, ops_per_thread: int = 20_000) -> None:
+    """Read throughput of ConcurrentBinarySearchTree for several writer ratios."""
+    num_keys = min(num_keys, 100_000)
+    print(f"Concurrent access, {num_threads} threads, AVLTree with {num_keys} keys")
+    for write_ratio in (0.0, 0.01, 0.1, 0.5):
+        tree = ConcurrentBinarySearchTree(AVLTree.from_sorted((key, key) for key in range(0, 2 * num_keys, 2)))
+        reads = [0] * num_threads
+
+        def worker(index):
+            rng = Random(index)
+            for _ in range(ops_per_thread):
+                key = rng.randrange(2 * num_keys)
+                if rng.random() < write_ratio:
+                    # Odd keys are never in the initial tree; toggle them. Another
+                    # writer may toggle the same key in between, so remove can miss.
+                    odd = key | 1
+                    try:
+                        tree.insert(odd, odd)
+                    except KeyError:
+                        try:
+                            tree.remove(odd)
+                        except KeyError:
+                            pass
+                else:
+                    try:
+                        tree.find(key)
+                    except KeyError:
+                        pass
+                    reads[index] += 1
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(num_threads)]
+        start = perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = perf_counter() - start
+        print(f"writers {write_ratio:>5.0%}: {sum(reads) / elapsed / 1e3:8.1f} k reads/s")
+
+
+def bench_btree(num_keys: int, num_probes: int = 100_000) -> None:
+    """Levels and lookup time of BTree compared with AVLTree."""
+    num_keys = min(num_keys, 200_000)
+    rng = Random(7)
+    probes = [rng.randrange(num_keys) for _ in range(num_probes)]
+    print(f"Lookups, {num_keys} keys, {num_probes} random probes")
+    avl = AVLTree.from_sorted((key, key) for key in range(num_keys))
+    trees = [("AVLTree", avl, avl.get_root().height)]
+    for fanout in (16, 64, 256):
+        btree = BTree(fanout=fanout)
+        for key in range(num_keys):
+            btree.insert(key, key)
+        trees.append((f"BTree(fanout={fanout})", btree, btree.height))
+    for label, tree, levels in trees:
+        start = perf_counter()
+        for key in probes:
+            tree.find(key)
+        elapsed = perf_counter() - start
+        print(f"{label:<40} {levels:3d} levels  {num_probes / elapsed / 1e3:8.1f} k lookups/s")
+
+
+def zipf_stream(keys, length: int, exponent: float = 1.1, seed: int = 11):
+    """Return length keys drawn so that the i-th most popular key has weight 1 / i ** exponent."""
+    rng = Random(seed)
+    popularity = list(keys)
+    rng.shuffle(popularity)
+    weights = [1 / rank ** exponent for rank in range(1, len(popularity) + 1)]
+    return rng.choices(popularity, weights=weights, k=length)
+
+
+def bench_splay(num_keys: int, num_finds: int = 200_000) -> None:
+    """Average comparisons per find on a Zipfian key stream, plain tree vs splay tree."""
+    num_keys = min(num_keys, 100_000)
+    keys = list(range(num_keys))
+    Random(3).shuffle(keys)
+    stream = zipf_stream(keys, num_finds)
+    print(f"Zipfian finds (s=1.1), {num_keys} keys, {num_finds} finds")
+    for label, tree in (("BinarySearchTree", BinarySearchTree()), ("AVLTree", AVLTree()), ("SplayTree", SplayTree())):
+        for key in keys:
+            tree.insert(key, key)
+        tree.enable_instrumentation()
+        start = perf_counter()
+        for key in stream:
+            tree.find(key)
+        elapsed = perf_counter() - start
+        print(f"{label:<40} {tree.counters()['comparisons_per_operation']:6.1f} comparisons/find"
+              f"  {num_finds / elapsed / 1e3:8.1f} k finds/s")
+
+
+def bench_bloom(num_keys: int, num_finds: int = 200_000) -> None:
+    """Lookups where most keys are missing, with and without the Bloom filter."""
+    rng = Random(4)
+    keys = rng.sample(range(10 * num_keys), num_keys)
+    probes = [rng.randrange(10 * num_keys) for _ in range(num_finds)]
+    print(f"Lookups, {num_keys} keys, {num_finds} probes (~90% misses)")
+    for label, tree in (("AVLTree", AVLTree()), ("AVLTree(bloom_error_rate=0.01)", AVLTree(bloom_error_rate=0.01))):
+        for key in keys:
+            tree.insert(key, key)
+        start = perf_counter()
+        for key in probes:
+            try:
+                tree[key]
+            except KeyError:
+                pass
+        elapsed_getitem = perf_counter() - start
+        start = perf_counter()
+        for key in probes:
+            tree.get(key)
+        elapsed_get = perf_counter() - start
+        print(f"{label:<40} tree[key]: {num_finds / elapsed_getitem / 1e3:8.1f} k/s"
+              f"  get: {num_finds / elapsed_get / 1e3:8.1f} k/s")
+
+
+def bench_freeze(num_keys: int, num_finds: int = 200_000) -> None:
+    """Per-key find on an AVL tree vs one search_batch call on the frozen index."""
+    import numpy as np
+    rng = Random(5)
+    keys = rng.sample(range(10 * num_keys), num_keys)
+    probes = [keys[rng.randrange(num_keys)] for _ in range(num_finds)]
+    tree = AVLTree()
+    for key in keys:
+        tree.insert(key, key)
+    print(f"Lookups, {num_keys} keys, {num_finds} hits")
+    start = perf_counter()
+    for key in probes:
+        tree.find(key)
+    elapsed = perf_counter() - start
+    print(f"{'AVLTree.find':<40} {num_finds / elapsed / 1e6:8.2f} M finds/s")
+    start = perf_counter()
+    index = tree.freeze()
+    print(f"{'freeze()':<40} {perf_counter() - start:8.2f} s")
+    probe_array = np.array(probes, dtype=np.int64)
+    start = perf_counter()
+    index.search_batch(probe_array)
+    elapsed = perf_counter() - start
+    print(f"{'EytzingerIndex.search_batch':<40} {num_finds / elapsed / 1e6:8.2f} M finds/s")
+
+
+def bench_finger(num_keys: int, num_finds: int = 200_000) -> None:
+    """Comparisons and throughput of finds near the previous key vs random finds, with and without finger."""
+    rng = Random(6)
+    keys = list(range(num_keys))
+    rng.shuffle(keys)
+    walk, key = [], num_keys // 2
+    for _ in range(num_finds):
+        key = min(num_keys - 1, max(0, key + rng.randint(-8, 8)))
+        walk.append(key)
+    scattered = [rng.randrange(num_keys) for _ in range(num_finds)]
+    print(f"Finds, {num_keys} keys, {num_finds} finds (local steps of at most 8 keys vs random)")
+    for label, tree in (("AVLTree", AVLTree()), ("AVLTree(finger=True)", AVLTree(finger=True))):
+        for key in keys:
+            tree.insert(key, key)
+        for stream_label, stream in (("local", walk), ("random", scattered)):
+            tree.enable_instrumentation()
+            tree.reset_counters()
+            for key in stream:
+                tree.find(key)
+            comparisons = tree.counters()['comparisons_per_operation']
+            tree.disable_instrumentation()
+            start = perf_counter()
+            for key in stream:
+                tree.find(key)
+            elapsed = perf_counter() - start
+            print(f"{label + ', ' + stream_label:<40} {comparisons:6.1f} comparisons/find"
+                  f"  {num_finds / elapsed / 1e3:8.1f} k finds/s")
+
+
+def bench_sharded(num_keys: int, batch_size: int = 10_000, num_batches: int = 20) -> None:
+    """find_many batches on one AVL tree vs ShardedBinarySearchTree with 1, 2, 4, ... workers."""
+    import os
+    from sharded_bst import ShardedBinarySearchTree
+    rng = Random(7)
+    pairs = [(key, key) for key in rng.sample(range(10 * num_keys), num_keys)]
+    batches = [[pairs[rng.randrange(num_keys)][0] for _ in range(batch_size)] for _ in range(num_batches)]
+    print(f"find_many, {num_keys} keys, {num_batches} batches of {batch_size}, {os.cpu_count()} CPUs")
+    tree = AVLTree()
+    for key, value in pairs:
+        tree.insert(key, value)
+    start = perf_counter()
+    for batch in batches:
+        tree.find_many(batch)
+    elapsed = perf_counter() - start
+    print(f"{'AVLTree':<40} {num_batches * batch_size / elapsed / 1e3:8.1f} k keys/s")
+    num_shards = 1
+    while num_shards <= (os.cpu_count() or 1):
+        with ShardedBinarySearchTree(num_shards) as sharded:
+            sharded.insert_many(pairs)
+            sharded.rebalance()
+            start = perf_counter()
+            for batch in batches:
+                sharded.find_many(batch)
+            elapsed = perf_counter() - start
+        name = f"ShardedBinarySearchTree({num_shards})"
+        print(f"{name:<40} {num_batches * batch_size / elapsed / 1e3:8.1f} k keys/s")
+        num_shards *= 2
+
+
+if __name__ == '__main__':
+    num_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    bench_traversals(num_keys)
+    bench_memory(num_keys)
+    bench_concurrent(num_keys)
+    bench_btree(num_keys)
+    bench_splay(num_keys)
+    bench_bloom(num_keys)
+    bench_freeze(num_keys)
+    bench_finger(num_keys)
+    bench_sharded(num_keys)
@@ -0,0 +1,77 @@
+"""Counting Bloom filter answering "definitely absent" for BinarySearchTree lookups."""
+from math import ceil, log
+from typing import Any, List
+
+MASK = (1 << 64) - 1
+# Odd 64-bit multipliers; the high 32 bits of key * multiplier are well mixed.
+MULTIPLIER_1 = 0x9E3779B97F4A7C15
+MULTIPLIER_2 = 0xC2B2AE3D27D4EB4F
+# Counters stop at this value and are never decremented again.
+SATURATED = 255
+
+
+class CountingBloomFilter:
+    """Bloom filter with 8-bit counters instead of bits, so keys can be removed.
+
+    `key in filter` is False only if key was never added (or removed again);
+    a True answer is wrong with probability about error_rate while at most
+    capacity keys are stored.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """Initialize CountingBloomFilter.
+
+        Args:
+            capacity (int): Number of keys the filter is sized for.
+            error_rate (float, optional): False-positive rate at capacity keys. Defaults to 0.01.
+
+        Raises:
+            ValueError: If capacity < 1 or error_rate is not in (0, 1).
+        """
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate in (0, 1).")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.count = 0
+        self._num_counters = ceil(-capacity * log(error_rate) / log(2) ** 2)
+        self._num_hashes = max(1, round(self._num_counters / capacity * log(2)))
+        self._counters = bytearray(self._num_counters)
+        self._hashes = range(self._num_hashes)
+
+    def _positions(self, key: Any) -> List[int]:
+        """Return the counter positions of key by double hashing."""
+        h = hash(key)
+        h1 = (h * MULTIPLIER_1 & MASK) >> 32
+        h2 = (h * MULTIPLIER_2 & MASK) >> 32 | 1
+        m = self._num_counters
+        return [(h1 + i * h2) % m for i in range(self._num_hashes)]
+
+    def add(self, key: Any) -> None:
+        counters = self._counters
+        for i in self._positions(key):
+            if counters[i] < SATURATED:
+                counters[i] += 1
+        self.count += 1
+
+    def discard(self, key: Any) -> None:
+        """Remove a key which was added before."""
+        counters = self._counters
+        for i in self._positions(key):
+            if counters[i] < SATURATED:
+                counters[i] -= 1
+        self.count -= 1
+
+    def __contains__(self, key: Any) -> bool:
+        # Inlined _positions: most misses stop at the first or second counter.
+        h = hash(key)
+        position = (h * MULTIPLIER_1 & MASK) >> 32
+        step = (h * MULTIPLIER_2 & MASK) >> 32 | 1
+        m, counters = self._num_counters, self._counters
+        for _ in self._hashes:
+            if not counters[position % m]:
+                return False
+            position += step
+        return True
+
+    def __len__(self) -> int:
+        return self.count
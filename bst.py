@@ -1,25 +1,200 @@
-from typing import Any, Generator, Tuple
+from array import array
+from bisect import bisect_left, bisect_right
+from copy import deepcopy
+from typing import Any, Generator, Iterable, List, Tuple
 
-from tree_node import TreeNode
+from bloom_filter import CountingBloomFilter
+from monoid import Monoid
+from bst_storage import MappedBinarySearchTree, dump_items, load_items
+from tree_cursor import TreeCursor
+from tree_node import AggregateTreeNode, TreeNode
+
+# Smallest capacity of the Bloom filter, so that small trees do not regrow it all the time.
+MIN_BLOOM_CAPACITY = 1024
 
 
 class BinarySearchTree:
     """Binary-Search-Tree implemented for didactic reasons."""
 
-    def __init__(self, root: TreeNode = None):
+    # True for trees whose lookups restructure the tree (see SplayTree).
+    mutating_reads = False
+
+    def __init__(self, root: TreeNode = None, monoid: Monoid = None, bloom_error_rate: float = None,
+                 finger: bool = False):
         """Initialize BinarySearchTree.
 
         Args:
             root (TreeNode, optional): Root of the BST. Defaults to None.
+            monoid (Monoid, optional): Keep AggregateTreeNode.aggregate of every subtree
+                with this monoid (see monoid.py) to answer aggregate() queries.
+                Defaults to None.
+            bloom_error_rate (float, optional): Put a counting Bloom filter with
+                this false-positive rate in front of find and get, so that most
+                misses never descend the tree. Defaults to None (no filter).
+            finger (bool, optional): Start every search at the node the previous
+                search ended at, climbing parent pointers only as far as needed,
+                so a key near the previous one costs O(log distance) instead of
+                O(log n). Random keys cost up to twice as much. Defaults to False.
 
         Raises:
             ValueError: root is neither a TreeNode nor None.
         """
         self._root = root
-        self._size = 0 if root is None else 1
+        self._size = 0 if root is None else root.size
+        self._monoid = monoid
+        # Class of the nodes insert and the balanced rebuilds create.
+        self._node_class = AggregateTreeNode if monoid else TreeNode
         self._num_of_comparisons = 0
+        self._num_of_node_visits = 0
+        self._num_of_operations = 0
+        # Cached endpoints, kept current by insert and remove.
+        self._min_node = self._leftmost(root)
+        self._max_node = self._rightmost(root)
+        self._bloom_error_rate = bloom_error_rate
+        self._rebuild_bloom()
+        self._finger_search = finger
+        self._finger = None
+        if finger:
+            self._descend = self._finger_descend
+
+    @classmethod
+    def from_sorted(cls, items: Iterable[Tuple[int, Any]], **settings) -> 'BinarySearchTree':
+        """Build a perfectly balanced tree from (key, value) pairs in linear time.
+
+        Pairs which are not sorted by key are sorted first (O(n log n) then).
+
+        Args:
+            items (Iterable[Tuple[int, Any]]): (key, value) pairs.
+            **settings: Passed on to the constructor (e.g. monoid).
+
+        Raises:
+            ValueError: If a key or value is None.
+            KeyError: If a key occurs more than once.
 
-    def insert(self, key: int, value: Any) -> None:
+        Returns:
+            BinarySearchTree: New tree containing all pairs.
+        """
+        pairs = list(items)
+        for key, value in pairs:
+            if key == None or value == None:
+                raise ValueError
+        if any(pairs[i][0] >= pairs[i + 1][0] for i in range(len(pairs) - 1)):
+            pairs.sort(key=lambda pair: pair[0])
+            for i in range(len(pairs) - 1):
+                if pairs[i][0] == pairs[i + 1][0]:
+                    raise KeyError(f"Key {pairs[i][0]} already exists in the tree.")
+
+        return cls._from_pairs(pairs, **settings)
+
+    @classmethod
+    def _from_pairs(cls, pairs: List[Tuple[int, Any]], **settings) -> 'BinarySearchTree':
+        """Build a balanced tree from (key, value) pairs already sorted by unique keys."""
+        tree = cls(**settings)
+        tree._link_pairs(pairs)
+        return tree
+
+    @classmethod
+    def _from_flat(cls, keys: Iterable[int], values: Iterable[Any], settings: dict) -> 'BinarySearchTree':
+        """Rebuild a tree flattened by __reduce__."""
+        return cls._from_pairs(list(zip(keys, values)), **settings)
+
+    def freeze(self) -> 'EytzingerIndex':
+        """Return a read-only snapshot of the tree as an EytzingerIndex (needs NumPy).
+
+        The index answers whole arrays of lookups with search_batch; later
+        changes to the tree do not show up in it. Keys have to fit into a
+        signed 64-bit integer.
+        """
+        # Imported here so that the tree itself works without NumPy.
+        from eytzinger_index import EytzingerIndex
+        return EytzingerIndex(*self._flatten())
+
+    def dump(self, path: str) -> None:
+        """Write the tree to path in the compact sorted layout of bst_storage.
+
+        Keys have to fit into a signed 64-bit integer, values are pickled.
+        """
+        dump_items(path, ((node.key, node.value) for node in self._inorder(self._root)))
+
+    @classmethod
+    def load(cls, path: str, lazy: bool = False, **settings):
+        """Load a tree written by dump.
+
+        Args:
+            path (str): File written by dump.
+            lazy (bool, optional): Memory-map the file and return a read-only
+                MappedBinarySearchTree which reads keys and values on demand.
+                Defaults to False.
+            **settings: Passed on to the constructor (e.g. monoid); not allowed with lazy.
+
+        Raises:
+            ValueError: If path is no (complete) dump or settings are given with lazy.
+
+        Returns:
+            A balanced tree built in linear time (or the mapped view).
+        """
+        if lazy:
+            if settings:
+                raise ValueError("A mapped tree takes no settings.")
+            return MappedBinarySearchTree(path)
+        return cls._from_pairs(load_items(path), **settings)
+
+    def merge(self, other: 'BinarySearchTree') -> 'BinarySearchTree':
+        """Return a new balanced tree holding the nodes of both trees in O(n + m).
+
+        Both trees are walked in inorder side by side; neither is modified.
+
+        Raises:
+            KeyError: If a key is present in both trees.
+        """
+        pairs = []
+        mine, theirs = self._inorder(self._root), other._inorder(other._root)
+        a, b = next(mine, None), next(theirs, None)
+        while a and b:
+            if a.key < b.key:
+                pairs.append((a.key, a.value))
+                a = next(mine, None)
+            elif b.key < a.key:
+                pairs.append((b.key, b.value))
+                b = next(theirs, None)
+            else:
+                raise KeyError(f"Key {a.key} already exists in the tree.")
+        for rest, node in ((mine, a), (theirs, b)):
+            while node:
+                pairs.append((node.key, node.value))
+                node = next(rest, None)
+        return self._from_pairs(pairs, **self._settings())
+
+    def split(self, key: int) -> Tuple['BinarySearchTree', 'BinarySearchTree']:
+        """Return two new balanced trees with the keys < key and >= key in O(n).
+
+        Raises:
+            ValueError: If key is None.
+        """
+        if key == None:
+            raise ValueError
+        pairs = [(node.key, node.value) for node in self._inorder(self._root)]
+        cut = bisect_left(pairs, key, key=lambda pair: pair[0])
+        settings = self._settings()
+        return self._from_pairs(pairs[:cut], **settings), self._from_pairs(pairs[cut:], **settings)
+
+    @classmethod
+    def join(cls, left: 'BinarySearchTree', right: 'BinarySearchTree') -> 'BinarySearchTree':
+        """Return a new balanced tree holding left followed by right in O(n + m).
+
+        The new tree has the class and settings (e.g. monoid) of left.
+
+        Raises:
+            ValueError: If not every key of left is smaller than every key of right.
+        """
+        left_max, right_min = left.return_max_key(), right.return_min_key()
+        if left_max and right_min and not left_max.key < right_min.key:
+            raise ValueError("All keys of left must be smaller than the keys of right.")
+        pairs = [(node.key, node.value) for node in left._inorder(left._root)]
+        pairs.extend((node.key, node.value) for node in right._inorder(right._root))
+        return type(left)._from_pairs(pairs, **left._settings())
+
+    def insert(self, key: int, value: Any) -> TreeNode:
         """Insert a new node into BST.
 
         Args:
@@ -29,31 +204,38 @@ class BinarySearchTree:
         Raises:
             ValueError: If key is not an integer.
             KeyError: If key is already present in the tree.
+
+        Returns:
+            TreeNode: The new node.
         """
         if key == None or value == None:
             raise ValueError
 
-        new_node = TreeNode(key, value)
-        if not self._root:
+        parent, node = self._descend(key)
+        if node:
+            raise KeyError(f"Key {key} already exists in the tree.")
+        new_node = self._node_class(key, value)
+        if not parent:
             self._root = new_node
             self._size = 1
+            self._min_node = self._max_node = new_node
+            self._update(new_node)
         else:
-            parent, node = None, self._root
-            while node:
-                parent = node
-                if key < node.key:
-                    node = node.left
-                elif key > node.key:
-                    node = node.right
-                else:
-                    raise KeyError(f"Key {key} already exists in the tree.")
             if key < parent.key:
                 parent.left = new_node
+                self._thread(new_node, parent.prev_node, parent)
             else:
                 parent.right = new_node
+                self._thread(new_node, parent, parent.next_node)
             new_node.parent = parent
+            if new_node.prev_node is None:
+                self._min_node = new_node
+            if new_node.next_node is None:
+                self._max_node = new_node
             self._size += 1
-
+            self._retrace(new_node)
+        self._bloom_add(key)
+        return new_node
 
     def find(self, key: int) -> TreeNode:
         """Return node with given key.
@@ -70,24 +252,38 @@ class BinarySearchTree:
         """
         if key == None:
             raise ValueError
+        if self._bloom is not None and key not in self._bloom:
+            raise KeyError(f"Key {key} not found in the tree.")
 
-        node = self._root
-        while node:
-            if key < node.key:
-                node = node.left
-            elif key > node.key:
-                node = node.right
-            else:
-                return node
+        node = self._descend(key)[1]
+        if node:
+            return node
         raise KeyError(f"Key {key} not found in the tree.")
 
+    def get(self, key: int, default: Any = None) -> Any:
+        """Return value of node with given key, or default if it is missing.
+
+        Unlike find and tree[key], a miss raises nothing; with a Bloom filter
+        most misses return without touching the tree.
+
+        Raises:
+            ValueError: If key is None.
+        """
+        if key == None:
+            raise ValueError
+        if self._bloom is not None and key not in self._bloom:
+            return default
+        node = self._descend(key)[1]
+        return node.value if node else default
+
     @property
     def size(self) -> int:
         """Return number of nodes contained in the tree."""
         return self._size
 
     # If users instead call `len(tree)`, this makes it return the same as `tree.size`
-    __len__ = size
+    def __len__(self) -> int:
+        return self._size
 
     # This is what gets called when you call e.g. `tree[5]`
     def __getitem__(self, key: int) -> Any:
@@ -105,6 +301,43 @@ class BinarySearchTree:
         """
         return self.find(key).value
 
+    def find_many(self, keys: Iterable[int], default: Any = None) -> List[Any]:
+        """Return the values of many keys at once, in the order of keys.
+
+        The probe keys are sorted and resolved in one traversal: a subtree is
+        entered once for all probes that fall into it instead of once per probe.
+        Missing keys produce default instead of raising KeyError.
+
+        Args:
+            keys (Iterable[int]): Keys to look for (duplicates allowed).
+            default (Any, optional): Result for missing keys. Defaults to None.
+
+        Raises:
+            ValueError: If a key is None.
+
+        Returns:
+            List[Any]: Values (or default) in the same order as keys.
+        """
+        keys = list(keys)
+        if any(key == None for key in keys):
+            raise ValueError
+        results = [default] * len(keys)
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        probes = [keys[i] for i in order]
+
+        stack = [(self._root, 0, len(probes))]
+        while stack:
+            node, low, high = stack.pop()
+            if not node or low >= high:
+                continue
+            equal_low = bisect_left(probes, node.key, low, high)
+            equal_high = bisect_right(probes, node.key, equal_low, high)
+            for i in range(equal_low, equal_high):
+                results[order[i]] = node.value
+            stack.append((node.left, low, equal_low))
+            stack.append((node.right, equal_high, high))
+        return results
+
     def remove(self, key: int) -> None:
         """Remove node with given key, maintaining BST-properties.
 
@@ -118,54 +351,64 @@ class BinarySearchTree:
         if key == None:
             raise ValueError
         # Find the node to remove
-        node = self._root
-        parent = None
-        while node and node.key != key:
-            parent = node
-            if key < node.key:
-                node = node.left
-            else:
-                node = node.right
+        node = self._descend(key)[1]
 
         if not node:  # The key is not found
-            raise KeyError
+            raise KeyError(f"Key {key} not found in the tree.")
+        return self.remove_node(node)
+
+    def remove_node(self, node: TreeNode) -> None:
+        """Remove a node of this tree (e.g. obtained from find) without searching for it.
 
+        Nodes are relinked, never copied into each other, so every other node
+        handle keeps its key and value.
+
+        Args:
+            node (TreeNode): Node which should be deleted; it must belong to this tree.
+
+        Raises:
+            KeyError: If node is detached, e.g. because it was removed before.
+        """
+        if node.parent is None and node is not self._root:
+            raise KeyError(f"Node with key {node.key} is not linked into the tree.")
         # Case 1: Node with two children
         if node.left and node.right:
-            # Find the in-order successor (smallest in the right subtree)
-            succ_parent = node
-            successor = node.right
-            while successor.left:
-                succ_parent = successor
-                successor = successor.left
-
-            # Copy the successor's value to the node
-            node.key = successor.key
-            node.value = successor.value
-            # Recursively remove the successor
-            node = successor
-            parent = succ_parent
+            # The in-order successor (smallest in the right subtree) takes the node's place
+            successor = self._leftmost(node.right)
+            if successor.parent is node:
+                retrace_from = successor
+            else:
+                retrace_from = successor.parent
+                self._replace_child(successor.parent, successor, successor.right)
+                successor.right = node.right
+                node.right.parent = successor
+            successor.left = node.left
+            node.left.parent = successor
+            self._replace_child(node.parent, node, successor)
 
         # Case 2: Node with only one child or no child
-        child = node.left if node.left else node.right
-        if not parent:
-            # The node to remove is the root
-            self._root = child
-        elif parent.left == node:
-            parent.left = child
         else:
-            parent.right = child
+            retrace_from = node.parent
+            self._replace_child(node.parent, node, node.left if node.left else node.right)
 
-        # If the child is not None, set its parent (only necessary if using parent pointers)
-        if child:
-            child.parent = parent
+        if node is self._min_node:
+            self._min_node = node.next_node
+        if node is self._max_node:
+            self._max_node = node.prev_node
+        if node is self._finger:
+            self._finger = node.next_node or node.prev_node
+        self._unthread(node)
+        node.parent = node.left = node.right = None
 
         self._size -= 1
+        self._retrace(retrace_from)
+        if self._bloom is not None:
+            self._bloom.discard(node.key)
         return True
 
-    # Hint: The following 3 methods can be implemented recursively, and
-    # the keyword `yield from` might be extremely useful here:
-    # http://simeonvisser.com/posts/python-3-using-yield-from-in-generators-part-1.html
+    # The following 3 methods delegate to iterative helpers with an explicit
+    # stack, so every node costs O(1) amortized and deep trees cannot hit the
+    # recursion limit.
 
     # Also, we use a small syntactic sugar here:
     # https://www.pythoninformer.com/python-language/intermediate-python/short-circuit-evaluation/
@@ -192,6 +435,145 @@ class BinarySearchTree:
             return iter(())
         yield from self._postorder(node)
 
+    def range_items(self, lo: int, hi: int) -> Generator[TreeNode, None, None]:
+        """Yield nodes with lo <= key < hi in inorder.
+
+        Subtrees outside the bounds are never entered, so this costs
+        O(height + k) for k yielded nodes.
+
+        Raises:
+            ValueError: If a bound is None.
+        """
+        if lo == None or hi == None:
+            raise ValueError
+        stack = []
+        node = self._root
+        while stack or node:
+            while node:
+                if node.key < lo:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if not node.key < hi:
+                return
+            yield node
+            node = node.right
+
+    def count_range(self, lo: int, hi: int) -> int:
+        """Return the number of keys with lo <= key < hi in O(height)."""
+        return max(0, self.rank(hi) - self.rank(lo))
+
+    def aggregate(self, lo: int, hi: int) -> Any:
+        """Return the monoid aggregate of all nodes with lo <= key < hi in O(height).
+
+        Raises:
+            ValueError: If the tree keeps no aggregates or a bound is None.
+        """
+        if not self._monoid:
+            raise ValueError("The tree was created without a monoid.")
+        if lo == None or hi == None:
+            raise ValueError
+        combine, identity = self._monoid.combine, self._monoid.identity
+
+        # Descend to the topmost node inside the range; everything in range lies below it.
+        split = self._root
+        while split and not (lo <= split.key < hi):
+            split = split.right if split.key < lo else split.left
+        if not split:
+            return identity
+
+        # Keys in [lo, split.key): whole right subtrees along the path towards lo.
+        left_part, node = identity, split.left
+        while node:
+            if node.key >= lo:
+                left_part = combine(combine(self._lift(node), self._aggregate_of(node.right)), left_part)
+                node = node.left
+            else:
+                node = node.right
+        # Keys in (split.key, hi): whole left subtrees along the path towards hi.
+        right_part, node = identity, split.right
+        while node:
+            if node.key < hi:
+                right_part = combine(right_part, combine(self._aggregate_of(node.left), self._lift(node)))
+                node = node.right
+            else:
+                node = node.left
+        return combine(combine(left_part, self._lift(split)), right_part)
+
+    def select(self, k: int) -> TreeNode:
+        """Return the node with the k-th smallest key (k = 0 is the minimum) in O(height).
+
+        Raises:
+            IndexError: If k is not in range(size).
+        """
+        if not 0 <= k < self._size_of(self._root):
+            raise IndexError(f"Index {k} out of range.")
+        node = self._root
+        while True:
+            left_size = self._size_of(node.left)
+            if k < left_size:
+                node = node.left
+            elif k > left_size:
+                k -= left_size + 1
+                node = node.right
+            else:
+                return node
+
+    def rank(self, key: int) -> int:
+        """Return the number of keys in the tree which are smaller than key in O(height).
+
+        Raises:
+            ValueError: If key is None.
+        """
+        if key == None:
+            raise ValueError
+        rank = 0
+        node = self._root
+        while node:
+            if key <= node.key:
+                node = node.left
+            else:
+                rank += self._size_of(node.left) + 1
+                node = node.right
+        return rank
+
+    @staticmethod
+    def successor(node: TreeNode) -> TreeNode:
+        """Return the node with the next larger key (None for the maximum) in O(1)."""
+        return node.next_node
+
+    @staticmethod
+    def predecessor(node: TreeNode) -> TreeNode:
+        """Return the node with the next smaller key (None for the minimum) in O(1)."""
+        return node.prev_node
+
+    def cursor(self, key: int = None) -> TreeCursor:
+        """Return a cursor on the smallest node with a key >= key.
+
+        Without a key the cursor starts at the minimum. Seeking costs
+        O(height), every further step O(1).
+        """
+        return TreeCursor(self.ceiling(key) if key != None else self.return_min_key())
+
+    def ceiling(self, key: int) -> TreeNode:
+        """Return the node with the smallest key >= key (None if there is none)."""
+        if key == None:
+            raise ValueError
+        node, best = self._root, None
+        while node:
+            if key < node.key:
+                best = node
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return node
+        return best
+
     # this allows for e.g. `for node in tree`, or `list(tree)`.
     def __iter__(self) -> Generator[TreeNode, None, None]:
         yield from self._preorder(self._root)
@@ -200,53 +582,144 @@ class BinarySearchTree:
     def is_valid(self) -> bool:
         """Return if the tree fulfills BST-criteria."""
 
-        def is_valid_node(node, low=-float('inf'), high=float('inf')):
+        stack = [(self._root, -float('inf'), float('inf'))]
+        while stack:
+            node, low, high = stack.pop()
             if not node:
-                return True
+                continue
             if not (low < node.key < high):
                 return False
-            return (is_valid_node(node.left, low, node.key) and
-                    is_valid_node(node.right, node.key, high))
-
-        return is_valid_node(self._root)
+            stack.append((node.left, low, node.key))
+            stack.append((node.right, node.key, high))
+        return True
 
     def return_max_key(self) -> TreeNode:
-            """Return the node with the largest key (None if tree is empty)."""
-            current = self._root
-            while current and current.right:
-                current = current.right
-            return current
+        """Return the node with the largest key (None if tree is empty) in O(1)."""
+        return self._max_node
+
+    def pop_max(self) -> TreeNode:
+        """Remove and return the node with the largest key (None if tree is empty)."""
+        node = self._max_node
+        if node:
+            self.remove_node(node)
+        return node
 
     def find_comparison(self, key: int) -> Tuple[int, int]:
-        """Create an inbuilt python list of BST values in preorder and compute the number of comparisons needed for
+        """Scan the BST values in preorder like a python list and compute the number of comparisons needed for
            finding the key both in the list and in the BST.
            Return the numbers of comparisons for both, the list and the BST
         """
 
         list_comparisons = 0
-        bst_comparisons = 1
-        python_list = list(node.key for node in self._preorder(self._root))
-        for item in python_list: # Check comparisons for list
+        for node in self._preorder(self._root): # Check comparisons for list (scanned lazily)
             list_comparisons += 1
-            if item == key:
+            if node.key == key:
                 break
         else:
             list_comparisons = float('inf')  # Key not found
 
-        node = self._root # Comparisons in BST
-        while node:
-            bst_comparisons += 1
-            if key < node.key:
-                node = node.left
-            elif key > node.key:
-                node = node.right
-            else:
-                break
-        else:
+        _, node, bst_comparisons, _ = self._count_descent(key)
+        if not node:
             bst_comparisons = float('inf')  # Not found
 
         return (list_comparisons, bst_comparisons)
 
+    def enable_instrumentation(self) -> None:
+        """Start counting comparisons and node visits of find, insert and remove.
+
+        The counting descent is installed on this instance only, so a tree with
+        instrumentation switched off runs the plain code without any checks.
+        """
+        self._descend = self._counted_descend
+
+    def disable_instrumentation(self) -> None:
+        """Stop counting; the counters keep their values."""
+        self.__dict__.pop('_descend', None)
+        if self._finger_search:
+            self._descend = self._finger_descend
+
+    @property
+    def instrumented(self) -> bool:
+        return self.__dict__.get('_descend') == self._counted_descend
+
+    def counters(self) -> dict:
+        """Return the counters collected while instrumentation was enabled.
+
+        Returns:
+            dict: operations, comparisons and node_visits in total, and
+            comparisons and node visits per operation.
+        """
+        operations = self._num_of_operations
+        return {
+            'operations': operations,
+            'comparisons': self._num_of_comparisons,
+            'node_visits': self._num_of_node_visits,
+            'comparisons_per_operation': self._num_of_comparisons / operations if operations else 0.0,
+            'node_visits_per_operation': self._num_of_node_visits / operations if operations else 0.0,
+        }
+
+    def reset_counters(self) -> None:
+        self._num_of_operations = 0
+        self._num_of_comparisons = 0
+        self._num_of_node_visits = 0
+
+    def stats(self) -> dict:
+        """Return shape statistics of the tree, computed in one iterative pass.
+
+        Returns:
+            dict: size, height (0 for an empty tree), mean_depth, depth_histogram
+            (number of nodes per depth, root depth 0) and balance, the height
+            divided by the smallest possible height for this size (1.0 means
+            perfectly balanced; a degenerate tree approaches size / log2(size)).
+        """
+        histogram = []
+        stack = [(self._root, 0)] if self._root else []
+        while stack:
+            node, depth = stack.pop()
+            if depth == len(histogram):
+                histogram.append(0)
+            histogram[depth] += 1
+            if node.left:
+                stack.append((node.left, depth + 1))
+            if node.right:
+                stack.append((node.right, depth + 1))
+        size = sum(histogram)
+        height = len(histogram)
+        return {
+            'size': size,
+            'height': height,
+            'mean_depth': sum(depth * count for depth, count in enumerate(histogram)) / size if size else 0.0,
+            'depth_histogram': histogram,
+            'balance': height / size.bit_length() if size else 1.0,
+        }
+
+    # Copies and pickles never follow node links: the tree is flattened into
+    # sorted key and value lists and rebuilt balanced in O(n) without recursion.
+    # Settings carry over; the finger, counters and tombstones do not.
+
+    def __reduce__(self):
+        keys, values = self._flatten()
+        try:
+            # Integer keys pickle as one block of bytes.
+            keys = array('q', keys)
+        except (TypeError, OverflowError):
+            pass
+        return (type(self)._from_flat, (keys, values, self._settings()))
+
+    def __copy__(self) -> 'BinarySearchTree':
+        """Return a tree with new nodes holding the same value objects."""
+        keys, values = self._flatten()
+        return self._from_flat(keys, values, self._settings())
+
+    def __deepcopy__(self, memo: dict) -> 'BinarySearchTree':
+        """Return a tree with new nodes holding deep copies of the values."""
+        clone = type(self)(**self._settings())
+        # Registered first, so values referring back to this tree refer to the clone.
+        memo[id(self)] = clone
+        keys, values = self._flatten()
+        clone._link_pairs(list(zip(keys, deepcopy(values, memo))))
+        return clone
+
     def __repr__(self) -> str:
         return f"BinarySearchTree({list(self._inorder(self._root))})"
 
@@ -258,31 +731,315 @@ class BinarySearchTree:
         return self._root
 
     def _inorder(self, current_node):
-        if current_node:
-            yield from self._inorder(current_node.left)
+        stack = []
+        while stack or current_node:
+            while current_node:
+                stack.append(current_node)
+                current_node = current_node.left
+            current_node = stack.pop()
             yield current_node
-            yield from self._inorder(current_node.right)
+            current_node = current_node.right
 
     def _preorder(self, current_node):
-        if current_node:
+        stack = [current_node] if current_node else []
+        while stack:
+            current_node = stack.pop()
             yield current_node
-            yield from self._preorder(current_node.left)
-            yield from self._preorder(current_node.right)
+            if current_node.right:
+                stack.append(current_node.right)
+            if current_node.left:
+                stack.append(current_node.left)
 
     def _postorder(self, current_node):
-        if current_node:
-            yield from self._postorder(current_node.left)
-            yield from self._postorder(current_node.right)
-            yield current_node
+        stack = []
+        last_yielded = None
+        while stack or current_node:
+            if current_node:
+                stack.append(current_node)
+                current_node = current_node.left
+                continue
+            top = stack[-1]
+            if top.right and top.right is not last_yielded:
+                current_node = top.right
+            else:
+                last_yielded = stack.pop()
+                yield last_yielded
+
+    def _descend(self, key: int) -> Tuple[TreeNode, TreeNode]:
+        """Search key from the root.
+
+        Returns:
+            Tuple[TreeNode, TreeNode]: (parent, node) if node holds key, else
+            (last node visited, None).
+        """
+        parent, node = None, self._root
+        while node:
+            if key < node.key:
+                parent, node = node, node.left
+            elif key > node.key:
+                parent, node = node, node.right
+            else:
+                break
+        return parent, node
+
+    def _finger_descend(self, key: int) -> Tuple[TreeNode, TreeNode]:
+        """_descend which starts at the finger and moves the finger to where it ends."""
+        node = self._descent_start(key)[0]
+        parent = node.parent if node else None
+        while node:
+            if key < node.key:
+                parent, node = node, node.left
+            elif key > node.key:
+                parent, node = node, node.right
+            else:
+                break
+        self._finger = node or parent
+        return parent, node
+
+    def _descent_start(self, key: int) -> Tuple[TreeNode, int]:
+        """Return the lowest ancestor of the finger (itself included) whose subtree spans key.
+
+        Without a finger this is the root. Also return the number of parent
+        links climbed.
+        """
+        node = self._finger
+        if node is None:
+            return self._root, 0
+        climbed = 0
+        parent = node.parent
+        if key > node.key:
+            # Stop once node is a left child of a parent above key: its subtree spans key.
+            while parent and (node is parent.right or key >= parent.key):
+                node, parent = parent, parent.parent
+                climbed += 1
+        elif key < node.key:
+            while parent and (node is parent.left or key <= parent.key):
+                node, parent = parent, parent.parent
+                climbed += 1
+        return node, climbed
+
+    def _count_descent(self, key: int) -> Tuple[TreeNode, TreeNode, int, int]:
+        """Like _descend, but also return the comparisons and node visits needed.
+
+        Every visited node costs one equality check, plus one less-than check
+        for the nodes which do not hold key.
+        """
+        node, climbed = self._descent_start(key)
+        # Climbing compares key with every parent passed.
+        comparisons = visits = climbed
+        parent = node.parent if node else None
+        while node:
+            visits += 1
+            comparisons += 1
+            if key == node.key:
+                break
+            comparisons += 1
+            if key < node.key:
+                parent, node = node, node.left
+            else:
+                parent, node = node, node.right
+        return parent, node, comparisons, visits
+
+    def _counted_descend(self, key: int) -> Tuple[TreeNode, TreeNode]:
+        """_descend which adds to the instrumentation counters."""
+        parent, node, comparisons, visits = self._count_descent(key)
+        if self._finger_search:
+            self._finger = node or parent
+        self._num_of_operations += 1
+        self._num_of_comparisons += comparisons
+        self._num_of_node_visits += visits
+        return parent, node
+
+    @staticmethod
+    def _height(node: TreeNode) -> int:
+        return node.height if node else 0
+
+    @staticmethod
+    def _size_of(node: TreeNode) -> int:
+        return node.size if node else 0
+
+    def _settings(self) -> dict:
+        """Return the constructor arguments which create an empty tree configured like this one."""
+        return {'monoid': self._monoid, 'bloom_error_rate': self._bloom_error_rate, 'finger': self._finger_search}
+
+    def _flatten(self) -> Tuple[List[int], List[Any]]:
+        """Return the keys and the values of all nodes in key order."""
+        nodes = list(self._inorder(self._root))
+        return [node.key for node in nodes], [node.value for node in nodes]
+
+    def _link_pairs(self, pairs: List[Tuple[int, Any]]) -> None:
+        """Make this empty tree a balanced tree of (key, value) pairs sorted by unique keys."""
+        node_class = self._node_class
+        nodes = [node_class(key, value) for key, value in pairs]
+        self._root = self._link_balanced(nodes)
+        self._size = len(nodes)
+        if nodes:
+            self._min_node, self._max_node = nodes[0], nodes[-1]
+        self._rebuild_bloom()
+
+    def _rebuild_bloom(self) -> None:
+        """Create a Bloom filter with room for twice the current keys and add them all."""
+        if self._bloom_error_rate is None:
+            self._bloom = None
+            return
+        self._bloom = CountingBloomFilter(max(MIN_BLOOM_CAPACITY, 2 * self._size), self._bloom_error_rate)
+        for node in self._inorder(self._root):
+            self._bloom.add(node.key)
+
+    def _bloom_add(self, key: int) -> None:
+        """Add a newly inserted key to the Bloom filter, regrowing the filter when it is full."""
+        if self._bloom is None:
+            return
+        if self._bloom.count >= self._bloom.capacity:
+            # Rebuilding adds key as well, it is already linked into the tree.
+            self._rebuild_bloom()
+        else:
+            self._bloom.add(key)
+
+    def _lift(self, node: TreeNode) -> Any:
+        """Return the monoid element of node on its own."""
+        return self._monoid.lift(node.key, node.value)
+
+    def _aggregate_of(self, node: TreeNode) -> Any:
+        return node.aggregate if node else self._monoid.identity
+
+    def _update(self, node: TreeNode) -> None:
+        """Recompute the bookkeeping of node from its children."""
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+        node.size = 1 + self._size_of(node.left) + self._size_of(node.right)
+        if self._monoid:
+            combine = self._monoid.combine
+            node.aggregate = combine(combine(self._aggregate_of(node.left), self._lift(node)),
+                                     self._aggregate_of(node.right))
+
+    def _retrace(self, node: TreeNode) -> None:
+        """Walk from node up to the root, updating every node on the way.
+
+        Called after every structural change. Subclasses override this to
+        rebalance while walking up.
+        """
+        while node:
+            self._update(node)
+            node = node.parent
+
+    def _replace_child(self, parent: TreeNode, old: TreeNode, new: TreeNode) -> None:
+        """Hang new where old was hanging below parent (or as root)."""
+        if parent is None:
+            self._root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+        if new:
+            new.parent = parent
+
+    @staticmethod
+    def _thread(node: TreeNode, prev_node: TreeNode, next_node: TreeNode) -> None:
+        """Link node into the inorder thread between prev_node and next_node."""
+        node.prev_node, node.next_node = prev_node, next_node
+        if prev_node:
+            prev_node.next_node = node
+        if next_node:
+            next_node.prev_node = node
+
+    @staticmethod
+    def _unthread(node: TreeNode) -> None:
+        """Take node out of the inorder thread."""
+        if node.prev_node:
+            node.prev_node.next_node = node.next_node
+        if node.next_node:
+            node.next_node.prev_node = node.prev_node
+        node.prev_node = node.next_node = None
+
+    def _link_balanced(self, nodes: List[TreeNode], parent: TreeNode = None) -> TreeNode:
+        """Link sorted nodes into a perfectly balanced subtree below parent.
+
+        Runs in O(len(nodes)) without recursion and returns the subtree root,
+        which the caller still has to hang into place. The nodes are threaded
+        among themselves; linking the ends to outside neighbours is up to the
+        caller as well.
+        """
+        for prev_node, next_node in zip(nodes, nodes[1:]):
+            prev_node.next_node, next_node.prev_node = next_node, prev_node
+        root = None
+        linked = []
+        stack = [(0, len(nodes), parent, None)]
+        while stack:
+            low, high, above, is_left = stack.pop()
+            if low >= high:
+                if is_left is True:
+                    above.left = None
+                elif is_left is False:
+                    above.right = None
+                continue
+            mid = (low + high) // 2
+            node = nodes[mid]
+            node.parent = above
+            if is_left is None:
+                root = node
+            elif is_left:
+                above.left = node
+            else:
+                above.right = node
+            linked.append(node)
+            stack.append((mid + 1, high, node, False))
+            stack.append((low, mid, node, True))
+        # Children were linked after their parents, so walk backwards.
+        for node in reversed(linked):
+            self._update(node)
+        return root
+
+    def _rotate_left(self, node: TreeNode) -> TreeNode:
+        """Rotate node down to the left and return the new subtree root."""
+        pivot = node.right
+        self._replace_child(node.parent, node, pivot)
+        node.right = pivot.left
+        if pivot.left:
+            pivot.left.parent = node
+        pivot.left = node
+        node.parent = pivot
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_right(self, node: TreeNode) -> TreeNode:
+        """Rotate node down to the right and return the new subtree root."""
+        pivot = node.left
+        self._replace_child(node.parent, node, pivot)
+        node.left = pivot.right
+        if pivot.right:
+            pivot.right.parent = node
+        pivot.right = node
+        node.parent = pivot
+        self._update(node)
+        self._update(pivot)
+        return pivot
 
     # You can of course add your own methods and/or functions!
     # (A method is within a class, a function outside of it.)
 
     def return_min_key(self) -> TreeNode:
-        current = self._root
-        while current and current.left:
-            current = current.left
-        return current
+        """Return the node with the smallest key (None if tree is empty) in O(1)."""
+        return self._min_node
+
+    def pop_min(self) -> TreeNode:
+        """Remove and return the node with the smallest key (None if tree is empty)."""
+        node = self._min_node
+        if node:
+            self.remove_node(node)
+        return node
+
+    @staticmethod
+    def _leftmost(node: TreeNode) -> TreeNode:
+        while node and node.left:
+            node = node.left
+        return node
+
+    @staticmethod
+    def _rightmost(node: TreeNode) -> TreeNode:
+        while node and node.right:
+            node = node.right
+        return node
 
 bst = BinarySearchTree()
 test_list = []
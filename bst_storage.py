@@ -0,0 +1,154 @@
+"""Compact binary file format for BinarySearchTree contents.
+
+Layout (native byte order):
+
+    magic      4 bytes  b'BST1'
+    padding    4 bytes
+    count      uint64
+    keys       count * int64, sorted ascending
+    offsets    count * uint64, file offset of every value record
+    records    count * (uint32 length + pickled value)
+
+Keys and offsets are fixed-size, so a memory-mapped file can be searched by
+bisecting the key block without reading any values.
+"""
+import mmap
+import pickle
+import struct
+from array import array
+from bisect import bisect_left
+from typing import Any, Generator, Iterable, List, Tuple
+
+from tree_node import TreeNode
+
+MAGIC = b'BST1'
+HEADER = struct.Struct('=4s4xQ')
+LENGTH = struct.Struct('=I')
+
+
+def dump_items(path: str, pairs: Iterable[Tuple[int, Any]]) -> None:
+    """Write (key, value) pairs, sorted by unique int64 keys, to path."""
+    keys = array('q')
+    records = []
+    for key, value in pairs:
+        keys.append(key)
+        records.append(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+    offsets = array('Q')
+    position = HEADER.size + 2 * 8 * len(keys)
+    for record in records:
+        offsets.append(position)
+        position += LENGTH.size + len(record)
+
+    with open(path, 'wb') as fp:
+        fp.write(HEADER.pack(MAGIC, len(keys)))
+        keys.tofile(fp)
+        offsets.tofile(fp)
+        for record in records:
+            fp.write(LENGTH.pack(len(record)))
+            fp.write(record)
+
+
+def _read_header(buffer) -> int:
+    if len(buffer) < HEADER.size:
+        raise ValueError("Not a BinarySearchTree dump.")
+    magic, count = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a BinarySearchTree dump.")
+    if len(buffer) < HEADER.size + 16 * count:
+        raise ValueError("Truncated BinarySearchTree dump.")
+    return count
+
+
+def load_items(path: str) -> List[Tuple[int, Any]]:
+    """Read all (key, value) pairs, in key order, from a file written by dump_items."""
+    with open(path, 'rb') as fp:
+        data = fp.read()
+    count = _read_header(data)
+    keys = array('q')
+    keys.frombytes(data[HEADER.size:HEADER.size + 8 * count])
+    offsets = array('Q')
+    offsets.frombytes(data[HEADER.size + 8 * count:HEADER.size + 16 * count])
+
+    pairs = []
+    for key, offset in zip(keys, offsets):
+        (length,) = LENGTH.unpack_from(data, offset)
+        start = offset + LENGTH.size
+        pairs.append((key, pickle.loads(data[start:start + length])))
+    return pairs
+
+
+class MappedBinarySearchTree:
+    """Read-only tree view on a memory-mapped dump.
+
+    Lookups bisect the key block of the file, so only the pages touched by the
+    search (and the value that is returned) are ever read. `find` and the
+    traversal hand out detached TreeNode copies.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as fp:
+            self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._size = _read_header(self._mmap)
+        except ValueError:
+            self._mmap.close()
+            raise
+        view = memoryview(self._mmap)
+        self._keys = view[HEADER.size:HEADER.size + 8 * self._size].cast('q')
+        self._offsets = view[HEADER.size + 8 * self._size:HEADER.size + 16 * self._size].cast('Q')
+        view.release()
+
+    def close(self) -> None:
+        self._keys.release()
+        self._offsets.release()
+        self._mmap.close()
+
+    def __enter__(self) -> 'MappedBinarySearchTree':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def size(self) -> int:
+        """Return number of nodes contained in the tree."""
+        return self._size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _value(self, index: int) -> Any:
+        offset = self._offsets[index]
+        (length,) = LENGTH.unpack_from(self._mmap, offset)
+        start = offset + LENGTH.size
+        return pickle.loads(self._mmap[start:start + length])
+
+    def _index(self, key: int) -> int:
+        if key == None:
+            raise ValueError
+        index = bisect_left(self._keys, key)
+        if index == self._size or self._keys[index] != key:
+            raise KeyError(f"Key {key} not found in the tree.")
+        return index
+
+    def find(self, key: int) -> TreeNode:
+        """Return a detached node holding key and its value.
+
+        Raises:
+            ValueError: If key is None.
+            KeyError: If key is not present in the tree.
+        """
+        index = self._index(key)
+        return TreeNode(self._keys[index], self._value(index))
+
+    def __getitem__(self, key: int) -> Any:
+        return self._value(self._index(key))
+
+    def inorder(self) -> Generator[TreeNode, None, None]:
+        """Yield detached nodes in inorder."""
+        for index in range(self._size):
+            yield TreeNode(self._keys[index], self._value(index))
+
+    def __iter__(self) -> Generator[TreeNode, None, None]:
+        yield from self.inorder()
@@ -0,0 +1,306 @@
+from bisect import bisect_left
+from typing import Any, Generator
+
+from btree_node import BTreeNode
+from page_store import FilePageStore, MemoryPageStore
+from tree_node import TreeNode
+
+
+class BTree:
+    """B-tree with configurable fan-out behind the BinarySearchTree interface.
+
+    Every node holds up to fanout - 1 sorted keys, so a lookup visits
+    O(log_fanout n) nodes and does its comparisons within one node by bisection.
+    Nodes are addressed by page id through a page store: in memory by default,
+    or in a page file with an LRU page cache when a path is given.
+    `find` and the traversal hand out detached TreeNode copies.
+    """
+
+    def __init__(self, fanout: int = 64, path: str = None, page_size: int = 16384, cache_pages: int = 256):
+        """Initialize BTree.
+
+        Args:
+            fanout (int, optional): Maximum number of children of a node; must be even
+                and at least 4. Ignored when an existing page file is reopened.
+            path (str, optional): Page file to keep the nodes in. An existing file is
+                reopened. Defaults to None (nodes stay in memory).
+            page_size (int, optional): Size of a page in the page file in bytes.
+            cache_pages (int, optional): Number of pages kept in the LRU cache.
+
+        Raises:
+            ValueError: If fanout is odd or smaller than 4.
+        """
+        if fanout < 4 or fanout % 2:
+            raise ValueError("fanout must be an even number >= 4.")
+        self._store = FilePageStore(path, page_size, cache_pages) if path else MemoryPageStore()
+        meta = self._store.meta
+        if 'root' not in meta:
+            meta['fanout'] = fanout
+            meta['size'] = 0
+            meta['root'] = self._store.allocate().page_id
+        # Minimum degree: every node but the root keeps between t - 1 and 2t - 1 keys.
+        self._t = meta['fanout'] // 2
+
+    @property
+    def fanout(self) -> int:
+        return 2 * self._t
+
+    @property
+    def size(self) -> int:
+        """Return number of keys contained in the tree."""
+        return self._store.meta['size']
+
+    def __len__(self) -> int:
+        return self.size
+
+    def flush(self) -> None:
+        """Write all modified pages to the page file (no-op in memory)."""
+        self._store.flush()
+
+    def close(self) -> None:
+        self._store.close()
+
+    def __enter__(self) -> 'BTree':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _root(self) -> BTreeNode:
+        return self._store.get(self._store.meta['root'])
+
+    def find(self, key: int) -> TreeNode:
+        """Return a detached node holding key and its value.
+
+        Raises:
+            ValueError: If key is None.
+            KeyError: If key is not present in the tree.
+        """
+        if key == None:
+            raise ValueError
+        node = self._root()
+        while True:
+            i = bisect_left(node.keys, key)
+            if i < len(node.keys) and node.keys[i] == key:
+                return TreeNode(key, node.values[i])
+            if node.is_leaf:
+                raise KeyError(f"Key {key} not found in the tree.")
+            node = self._store.get(node.children[i])
+
+    def __getitem__(self, key: int) -> Any:
+        return self.find(key).value
+
+    def insert(self, key: int, value: Any) -> None:
+        """Insert a new key into the tree, splitting full nodes on the way down.
+
+        Raises:
+            ValueError: If key or value is None.
+            KeyError: If key is already present in the tree.
+        """
+        if key == None or value == None:
+            raise ValueError
+        store = self._store
+        node = self._root()
+        if len(node.keys) == 2 * self._t - 1:
+            new_root = store.allocate()
+            new_root.children.append(node.page_id)
+            self._split_child(new_root, 0)
+            store.meta['root'] = new_root.page_id
+            node = new_root
+        while True:
+            i = bisect_left(node.keys, key)
+            if i < len(node.keys) and node.keys[i] == key:
+                # Splits done so far leave a valid tree behind.
+                raise KeyError(f"Key {key} already exists in the tree.")
+            if node.is_leaf:
+                break
+            child = store.get(node.children[i])
+            if len(child.keys) == 2 * self._t - 1:
+                self._split_child(node, i)
+                if key == node.keys[i]:
+                    raise KeyError(f"Key {key} already exists in the tree.")
+                if key > node.keys[i]:
+                    child = store.get(node.children[i + 1])
+            node = child
+        node.keys.insert(i, key)
+        node.values.insert(i, value)
+        store.put(node)
+        store.meta['size'] += 1
+
+    def remove(self, key: int) -> None:
+        """Remove key, merging or refilling nodes on the way down so none underflows.
+
+        Raises:
+            ValueError: If key is None.
+            KeyError: If key is not present in the tree.
+        """
+        if key == None:
+            raise ValueError
+        store, t = self._store, self._t
+        node = self._root()
+        while True:
+            i = bisect_left(node.keys, key)
+            if i < len(node.keys) and node.keys[i] == key:
+                if node.is_leaf:
+                    del node.keys[i]
+                    del node.values[i]
+                    store.put(node)
+                    break
+                left, right = store.get(node.children[i]), store.get(node.children[i + 1])
+                if len(left.keys) >= t:
+                    # Replace key by its predecessor, then delete that from the left subtree.
+                    last = self._last_leaf(left)
+                    node.keys[i], node.values[i] = last.keys[-1], last.values[-1]
+                    store.put(node)
+                    key, node = last.keys[-1], left
+                elif len(right.keys) >= t:
+                    first = self._first_leaf(right)
+                    node.keys[i], node.values[i] = first.keys[0], first.values[0]
+                    store.put(node)
+                    key, node = first.keys[0], right
+                else:
+                    node = self._merge_children(node, i)
+            elif node.is_leaf:
+                # Nodes refilled on the way down leave a valid tree behind.
+                raise KeyError(f"Key {key} not found in the tree.")
+            else:
+                node = self._refill_child(node, i)
+        store.meta['size'] -= 1
+
+    def inorder(self) -> Generator[TreeNode, None, None]:
+        """Yield detached nodes in key order."""
+        stack = [(self._root(), 0)]
+        while stack:
+            node, i = stack.pop()
+            if node.is_leaf:
+                for key, value in zip(node.keys, node.values):
+                    yield TreeNode(key, value)
+                continue
+            if i > 0:
+                yield TreeNode(node.keys[i - 1], node.values[i - 1])
+            if i + 1 < len(node.children):
+                stack.append((node, i + 1))
+            stack.append((self._store.get(node.children[i]), 0))
+
+    def __iter__(self) -> Generator[TreeNode, None, None]:
+        yield from self.inorder()
+
+    @property
+    def height(self) -> int:
+        """Return the number of node levels (all leaves are on the same level)."""
+        height, node = 1, self._root()
+        while not node.is_leaf:
+            node = self._store.get(node.children[0])
+            height += 1
+        return height
+
+    @property
+    def is_valid(self) -> bool:
+        """Return if keys are ordered, nodes are filled correctly and all leaves are equally deep."""
+        t = self._t
+        root = self._root()
+        leaf_depths = set()
+        stack = [(root, -float('inf'), float('inf'), 1)]
+        while stack:
+            node, low, high, depth = stack.pop()
+            keys = node.keys
+            if any(not (low < key < high) for key in keys) or keys != sorted(keys):
+                return False
+            if len(keys) > 2 * t - 1 or (node is not root and len(keys) < t - 1):
+                return False
+            if node.is_leaf:
+                leaf_depths.add(depth)
+                continue
+            if len(node.children) != len(keys) + 1:
+                return False
+            bounds = [low] + keys + [high]
+            for i, page_id in enumerate(node.children):
+                stack.append((self._store.get(page_id), bounds[i], bounds[i + 1], depth + 1))
+        return len(leaf_depths) <= 1
+
+    def __repr__(self) -> str:
+        return f"BTree({list(self.inorder())})"
+
+    ####################################################
+    # Helper Functions
+    ####################################################
+
+    def _split_child(self, parent: BTreeNode, i: int) -> None:
+        """Split the full child i of parent, moving its median key up into parent."""
+        store, t = self._store, self._t
+        child = store.get(parent.children[i])
+        sibling = store.allocate()
+        sibling.keys, child.keys, median_key = child.keys[t:], child.keys[:t - 1], child.keys[t - 1]
+        sibling.values, child.values, median_value = child.values[t:], child.values[:t - 1], child.values[t - 1]
+        if not child.is_leaf:
+            sibling.children, child.children = child.children[t:], child.children[:t]
+        parent.keys.insert(i, median_key)
+        parent.values.insert(i, median_value)
+        parent.children.insert(i + 1, sibling.page_id)
+        store.put(child)
+        store.put(sibling)
+        store.put(parent)
+
+    def _merge_children(self, parent: BTreeNode, i: int) -> BTreeNode:
+        """Merge child i + 1 and the separating key of parent into child i and return it."""
+        store = self._store
+        left, right = store.get(parent.children[i]), store.get(parent.children[i + 1])
+        left.keys.append(parent.keys.pop(i))
+        left.values.append(parent.values.pop(i))
+        left.keys.extend(right.keys)
+        left.values.extend(right.values)
+        left.children.extend(right.children)
+        del parent.children[i + 1]
+        store.free(right.page_id)
+        store.put(left)
+        if not parent.keys:
+            # Only the root can run empty; its single child takes over.
+            store.meta['root'] = left.page_id
+            store.free(parent.page_id)
+        else:
+            store.put(parent)
+        return left
+
+    def _refill_child(self, parent: BTreeNode, i: int) -> BTreeNode:
+        """Make sure child i of parent has at least t keys and return the node to descend into."""
+        store, t = self._store, self._t
+        child = store.get(parent.children[i])
+        if len(child.keys) >= t:
+            return child
+        if i > 0:
+            left = store.get(parent.children[i - 1])
+            if len(left.keys) >= t:
+                # Rotate the last key of the left sibling through the parent.
+                child.keys.insert(0, parent.keys[i - 1])
+                child.values.insert(0, parent.values[i - 1])
+                parent.keys[i - 1], parent.values[i - 1] = left.keys.pop(), left.values.pop()
+                if not left.is_leaf:
+                    child.children.insert(0, left.children.pop())
+                store.put(left)
+                store.put(parent)
+                store.put(child)
+                return child
+        if i < len(parent.children) - 1:
+            right = store.get(parent.children[i + 1])
+            if len(right.keys) >= t:
+                child.keys.append(parent.keys[i])
+                child.values.append(parent.values[i])
+                parent.keys[i], parent.values[i] = right.keys.pop(0), right.values.pop(0)
+                if not right.is_leaf:
+                    child.children.append(right.children.pop(0))
+                store.put(right)
+                store.put(parent)
+                store.put(child)
+                return child
+            return self._merge_children(parent, i)
+        return self._merge_children(parent, i - 1)
+
+    def _last_leaf(self, node: BTreeNode) -> BTreeNode:
+        while not node.is_leaf:
+            node = self._store.get(node.children[-1])
+        return node
+
+    def _first_leaf(self, node: BTreeNode) -> BTreeNode:
+        while not node.is_leaf:
+            node = self._store.get(node.children[0])
+        return node
@@ -0,0 +1,21 @@
+from typing import Any, List
+
+
+class BTreeNode:
+    """Page of a BTree: sorted keys, their values and (for inner nodes) child page ids."""
+    __slots__ = ('page_id', 'keys', 'values', 'children')
+
+    def __init__(self, page_id: int, keys: List[int] = None, values: List[Any] = None,
+                 children: List[int] = None):
+        self.page_id = page_id
+        self.keys = keys if keys is not None else []
+        self.values = values if values is not None else []
+        # Page ids of the children; len(children) == len(keys) + 1 unless leaf.
+        self.children = children if children is not None else []
+
+    @property
+    def is_leaf(self) -> bool:
+        return not self.children
+
+    def __repr__(self) -> str:
+        return f"BTreeNode({self.page_id}, {self.keys})"
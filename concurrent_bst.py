@@ -0,0 +1,140 @@
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterable, List
+
+from bst import BinarySearchTree
+from tree_node import TreeNode
+
+
+class ReadWriteLock:
+    """Lock which admits many readers or a single writer.
+
+    Waiting writers block new readers, so a steady stream of reads cannot
+    starve updates. The lock is not reentrant.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    def acquire_read(self) -> None:
+        with self._condition:
+            while self._writer or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+
+    def release_write(self) -> None:
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class ConcurrentBinarySearchTree:
+    """Thread-safe wrapper around a BinarySearchTree (or a subclass such as AVLTree).
+
+    Lookups share a read lock and run side by side, updates take the write lock
+    and are serialized. Trees whose lookups restructure them (mutating_reads,
+    e.g. SplayTree) take the write lock for find, get and tree[key] as well.
+    Traversals return lists built under the read lock instead of generators,
+    so no lock is held while the caller iterates.
+    """
+
+    def __init__(self, tree: BinarySearchTree = None):
+        self._tree = tree if tree is not None else BinarySearchTree()
+        self._lock = ReadWriteLock()
+        self._lookup_locked = self._lock.write_locked if self._tree.mutating_reads else self._lock.read_locked
+
+    def insert(self, key: int, value: Any) -> None:
+        with self._lock.write_locked():
+            self._tree.insert(key, value)
+
+    def remove(self, key: int) -> None:
+        with self._lock.write_locked():
+            self._tree.remove(key)
+
+    def pop_min(self) -> TreeNode:
+        with self._lock.write_locked():
+            return self._tree.pop_min()
+
+    def pop_max(self) -> TreeNode:
+        with self._lock.write_locked():
+            return self._tree.pop_max()
+
+    def find(self, key: int) -> TreeNode:
+        with self._lookup_locked():
+            return self._tree.find(key)
+
+    def __getitem__(self, key: int) -> Any:
+        with self._lookup_locked():
+            return self._tree[key]
+
+    def get(self, key: int, default: Any = None) -> Any:
+        with self._lookup_locked():
+            return self._tree.get(key, default)
+
+    def find_many(self, keys: Iterable[int], default: Any = None) -> List[Any]:
+        with self._lock.read_locked():
+            return self._tree.find_many(keys, default)
+
+    @property
+    def size(self) -> int:
+        with self._lock.read_locked():
+            return self._tree.size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def inorder(self) -> List[TreeNode]:
+        """Return the nodes in inorder as a consistent list."""
+        with self._lock.read_locked():
+            return list(self._tree.inorder())
+
+    def range_items(self, lo: int, hi: int) -> List[TreeNode]:
+        """Return the nodes with lo <= key < hi as a consistent list."""
+        with self._lock.read_locked():
+            return list(self._tree.range_items(lo, hi))
+
+    def count_range(self, lo: int, hi: int) -> int:
+        with self._lock.read_locked():
+            return self._tree.count_range(lo, hi)
+
+    @property
+    def is_valid(self) -> bool:
+        with self._lock.read_locked():
+            return self._tree.is_valid
+
+    def __repr__(self) -> str:
+        with self._lock.read_locked():
+            return f"ConcurrentBinarySearchTree({self._tree!r})"
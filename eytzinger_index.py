@@ -0,0 +1,104 @@
+"""Read-only search index in Eytzinger layout, searched with NumPy (required by this module only)."""
+from typing import Any, Iterable
+
+import numpy as np
+
+
+def _as_int64(keys: Iterable[int]) -> np.ndarray:
+    """Return keys as an int64 array.
+
+    Raises:
+        ValueError: If a key is not an integer which fits into int64 (1.5, "7", 2**70, ...).
+    """
+    raw = np.asarray(keys)
+    if raw.dtype.kind == 'u' and raw.size and raw.max() > np.iinfo(np.int64).max:
+        raise ValueError("Keys have to fit into a signed 64-bit integer.")
+    try:
+        converted = raw.astype(np.int64)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("Keys have to be integers.") from None
+    if raw.dtype.kind not in 'biu' and not (converted == raw).all():
+        raise ValueError("Keys have to be integers.")
+    return converted
+
+
+class EytzingerIndex:
+    """Static index of integer keys, usually created by BinarySearchTree.freeze().
+
+    The keys are stored in breadth-first order of a complete binary tree
+    (Eytzinger layout): the children of slot k are the slots 2k and 2k + 1,
+    slot 0 is unused. The top levels of the tree share a few cache lines and
+    no pointers are stored. search_batch() descends with all probes at once,
+    one vectorized step per level and without branches per probe.
+    """
+
+    def __init__(self, keys: Iterable[int], values: Iterable[Any]):
+        """Initialize EytzingerIndex.
+
+        Args:
+            keys (Iterable[int]): Strictly increasing integer keys.
+            values (Iterable[Any]): Values of the keys in the same order.
+
+        Raises:
+            ValueError: If keys are not strictly increasing integers or the lengths differ.
+        """
+        sorted_keys = _as_int64(list(keys))
+        sorted_values = np.empty(len(sorted_keys), dtype=object)
+        sorted_values[:] = list(values)
+        n = len(sorted_keys)
+        if n > 1 and not (sorted_keys[1:] > sorted_keys[:-1]).all():
+            raise ValueError("Keys must be strictly increasing.")
+
+        # The tree is made perfect (2**height - 1 slots) by padding the sorted keys
+        # with the largest int64, so every probe descends exactly height levels.
+        self._size = n
+        self._height = n.bit_length()
+        slots = 1 << self._height
+        padded_keys = np.full(slots - 1, np.iinfo(np.int64).max, dtype=np.int64)
+        padded_keys[:n] = sorted_keys
+        # Sorted position of every slot; -1 for slot 0 (unused).
+        self._rank = np.full(slots, -1, dtype=np.int64)
+        for depth in range(self._height):
+            level = np.arange(1 << depth, 2 << depth, dtype=np.int64)
+            self._rank[level] = ((2 * (level - (1 << depth)) + 1) << (self._height - 1 - depth)) - 1
+        self._keys = np.zeros(slots, dtype=np.int64)
+        self._keys[1:] = padded_keys[self._rank[1:]]
+        self._values = sorted_values
+
+    def __len__(self) -> int:
+        return self._size
+
+    def search_batch(self, keys: Iterable[int], default: Any = None) -> np.ndarray:
+        """Look up a whole array of keys at once.
+
+        Args:
+            keys (Iterable[int]): Integer keys to look for (any order, duplicates allowed).
+            default (Any, optional): Result for missing keys. Defaults to None.
+
+        Raises:
+            ValueError: If a key is not an integer (probes are never rounded to one).
+
+        Returns:
+            np.ndarray: Object array with the value (or default) of every key.
+        """
+        probes = _as_int64(keys)
+        tree = self._keys
+        k = np.ones(probes.shape, dtype=np.int64)
+        for _ in range(self._height):
+            k = 2 * k + (tree[k] < probes)
+        # The last left turn was at the ceiling of the probe: strip the trailing
+        # right turns (ones) and that left turn; 0 means there is no ceiling.
+        lowest_zero = ~k & (k + 1)
+        ceiling = k // (2 * lowest_zero)
+        rank = self._rank[ceiling]
+        found = (rank >= 0) & (rank < self._size) & (tree[ceiling] == probes)
+        result = np.full(probes.shape, default, dtype=object)
+        result[found] = self._values[rank[found]]
+        return result
+
+    def get(self, key: int, default: Any = None) -> Any:
+        """Return value of key, or default if it is missing."""
+        return self.search_batch([key], default)[0]
+
+    def __repr__(self) -> str:
+        return f"EytzingerIndex(size={self._size})"
@@ -0,0 +1,101 @@
+from typing import Any, Generator, Tuple
+
+from avl_tree import AVLTree
+from monoid import Monoid
+from tree_node import TreeNode
+
+
+def interval_end(key: Tuple[int, int], value: Any) -> int:
+    return key[1]
+
+
+# AggregateTreeNode.aggregate of an interval tree: the largest end point in the subtree.
+MAX_END = Monoid(-float('inf'), max, interval_end)
+
+
+class IntervalTree(AVLTree):
+    """Balanced tree of closed intervals [start, end] keyed by (start, end).
+
+    Nodes are ordered by start (then end) and every node keeps the largest end
+    point of its subtree in AggregateTreeNode.aggregate. overlapping() skips
+    any subtree whose largest end point lies before the query and stops at the
+    first start behind it. Several intervals may share a start; the exact same
+    interval can be stored only once.
+
+    Many intervals are best loaded at once with
+    IntervalTree.from_sorted(((start, end), value) for ...).
+    """
+
+    def __init__(self, root: TreeNode = None, bloom_error_rate: float = None, finger: bool = False):
+        """Initialize IntervalTree.
+
+        Args:
+            root (TreeNode, optional): Root of the tree. Defaults to None.
+            bloom_error_rate (float, optional): See BinarySearchTree. Defaults to None.
+            finger (bool, optional): See BinarySearchTree. Defaults to False.
+        """
+        super().__init__(root, MAX_END, bloom_error_rate, finger)
+
+    def insert_interval(self, start: int, end: int, value: Any) -> TreeNode:
+        """Insert the interval [start, end] with its value.
+
+        Raises:
+            ValueError: If a bound or value is None or start > end.
+            KeyError: If the interval is already present in the tree.
+
+        Returns:
+            TreeNode: The new node, its key is (start, end).
+        """
+        if start == None or end == None or start > end:
+            raise ValueError
+        return self.insert((start, end), value)
+
+    def remove_interval(self, start: int, end: int) -> None:
+        """Remove the interval [start, end].
+
+        Raises:
+            ValueError: If a bound is None.
+            KeyError: If the interval is not present in the tree.
+        """
+        if start == None or end == None:
+            raise ValueError
+        self.remove((start, end))
+
+    def overlapping(self, a: int, b: int = None) -> Generator[TreeNode, None, None]:
+        """Lazily yield the nodes of all intervals overlapping [a, b] in order of start.
+
+        Without b, yield the intervals containing the point a. A node which
+        is visited but not reported lies on the path to a reported one or on
+        the search path for b, so k overlaps cost at most O((k + 1) log n)
+        and usually close to O(log n + k).
+
+        Raises:
+            ValueError: If a is None or a > b.
+        """
+        if b == None:
+            b = a
+        if a == None or a > b:
+            raise ValueError
+        stack = []
+        node = self._root
+        while True:
+            # Descend left only into subtrees which still reach a.
+            while node and node.aggregate >= a:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            start, end = node.key
+            if start > b:
+                # Every later node starts even further right.
+                return
+            if end >= a:
+                yield node
+            node = node.right
+
+    def _settings(self) -> dict:
+        # The monoid is fixed to MAX_END.
+        settings = super()._settings()
+        del settings['monoid']
+        return settings
@@ -0,0 +1,33 @@
+"""Monoids for the per-subtree aggregates of BinarySearchTree."""
+import operator
+from typing import Any, Callable
+
+
+def node_value(key: int, value: Any) -> Any:
+    return value
+
+
+def one(key: int, value: Any) -> int:
+    return 1
+
+
+class Monoid:
+    """Associative combine function with an identity element.
+
+    lift(key, value) turns a single node into an element of the monoid; the
+    aggregate of a key range is all lifted nodes combined in key order.
+    Only module-level functions are used for the predefined monoids, so trees
+    using them can be pickled.
+    """
+
+    def __init__(self, identity: Any, combine: Callable[[Any, Any], Any],
+                 lift: Callable[[int, Any], Any] = node_value):
+        self.identity = identity
+        self.combine = combine
+        self.lift = lift
+
+
+SUM = Monoid(0, operator.add)
+MIN = Monoid(float('inf'), min)
+MAX = Monoid(-float('inf'), max)
+COUNT = Monoid(0, operator.add, one)
@@ -0,0 +1,148 @@
+"""Page storage for BTree: in memory, or in a page file behind an LRU cache."""
+import os
+import pickle
+import struct
+from collections import OrderedDict
+from typing import Any, Dict
+
+from btree_node import BTreeNode
+
+LENGTH = struct.Struct('=I')
+# Pages on the free list hold only the id of the next free page (or this value).
+NO_PAGE = -1
+
+
+class MemoryPageStore:
+    """Keeps every BTreeNode as a live object; page ids are just dict keys."""
+
+    def __init__(self):
+        self._pages = {}
+        self._free = []
+        self._next_page = 1
+        self.meta = {}
+
+    def allocate(self) -> BTreeNode:
+        """Return a new, empty node with a fresh page id."""
+        if self._free:
+            page_id = self._free.pop()
+        else:
+            page_id = self._next_page
+            self._next_page += 1
+        node = BTreeNode(page_id)
+        self._pages[page_id] = node
+        return node
+
+    def get(self, page_id: int) -> BTreeNode:
+        return self._pages[page_id]
+
+    def put(self, node: BTreeNode) -> None:
+        """Record that node was modified (nothing to do in memory)."""
+        self._pages[node.page_id] = node
+
+    def free(self, page_id: int) -> None:
+        del self._pages[page_id]
+        self._free.append(page_id)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class FilePageStore:
+    """Stores BTreeNodes in fixed-size pages of a file, caching the hottest ones.
+
+    Page 0 holds the metadata (a pickled dict, including the head of the
+    on-disk free list); page i starts at offset i * page_size. Modified pages
+    stay in the LRU cache until they are evicted or flush() is called.
+    """
+
+    def __init__(self, path: str, page_size: int = 16384, cache_pages: int = 256):
+        if cache_pages < 8:
+            raise ValueError("The page cache needs room for at least 8 pages.")
+        self._page_size = page_size
+        self._cache_pages = cache_pages
+        self._cache = OrderedDict()
+        self._dirty = set()
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self._file = open(path, 'r+b' if exists else 'w+b')
+        if exists:
+            self.meta = self._read(0)
+            self._page_size = self.meta['page_size']
+        else:
+            self.meta = {'page_size': page_size, 'next_page': 1, 'free_head': NO_PAGE}
+            self._write(0, self.meta)
+
+    def _read(self, page_id: int) -> Any:
+        self._file.seek(page_id * self._page_size)
+        page = self._file.read(self._page_size)
+        (length,) = LENGTH.unpack_from(page, 0)
+        return pickle.loads(page[LENGTH.size:LENGTH.size + length])
+
+    def _write(self, page_id: int, payload: Any) -> None:
+        data = pickle.dumps(payload, pickle.HIGHEST_PROTOCOL)
+        if LENGTH.size + len(data) > self._page_size:
+            raise ValueError(f"Page {page_id} needs {LENGTH.size + len(data)} bytes but pages hold "
+                             f"{self._page_size}; use a larger page_size or a smaller fan-out.")
+        self._file.seek(page_id * self._page_size)
+        self._file.write(LENGTH.pack(len(data)) + data)
+
+    def _write_node(self, node: BTreeNode) -> None:
+        self._write(node.page_id, (node.keys, node.values, node.children))
+
+    def _cache_node(self, node: BTreeNode) -> None:
+        self._cache[node.page_id] = node
+        self._cache.move_to_end(node.page_id)
+        while len(self._cache) > self._cache_pages:
+            page_id, evicted = self._cache.popitem(last=False)
+            if page_id in self._dirty:
+                self._dirty.discard(page_id)
+                self._write_node(evicted)
+
+    def allocate(self) -> BTreeNode:
+        """Return a new, empty node, reusing a page from the free list if possible."""
+        page_id = self.meta['free_head']
+        if page_id != NO_PAGE:
+            self.meta['free_head'] = self._read(page_id)
+        else:
+            page_id = self.meta['next_page']
+            self.meta['next_page'] += 1
+        node = BTreeNode(page_id)
+        self.put(node)
+        return node
+
+    def get(self, page_id: int) -> BTreeNode:
+        node = self._cache.get(page_id)
+        if node is None:
+            keys, values, children = self._read(page_id)
+            node = BTreeNode(page_id, keys, values, children)
+        self._cache_node(node)
+        return node
+
+    def put(self, node: BTreeNode) -> None:
+        """Mark node as modified; it is written on eviction or flush."""
+        self._dirty.add(node.page_id)
+        self._cache_node(node)
+
+    def free(self, page_id: int) -> None:
+        self._cache.pop(page_id, None)
+        self._dirty.discard(page_id)
+        self._write(page_id, self.meta['free_head'])
+        self.meta['free_head'] = page_id
+
+    def flush(self) -> None:
+        """Write all modified pages and the metadata to the file."""
+        for page_id in sorted(self._dirty):
+            self._write_node(self._cache[page_id])
+        self._dirty.clear()
+        self._write(0, self.meta)
+        self._file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+    @property
+    def cache_info(self) -> Dict[str, int]:
+        return {'cached_pages': len(self._cache), 'dirty_pages': len(self._dirty)}
@@ -0,0 +1,225 @@
+from typing import Any, Generator
+
+from tree_node import TreeNode
+
+
+class PersistentBinarySearchTree:
+    """Persistent (path-copying) AVL tree.
+
+    Nodes are never modified once they are reachable from a root: insert and
+    remove copy the O(log n) nodes on the search path, rebalance the copies and
+    publish the new (root, size) version with a single assignment. Every older
+    version therefore stays valid and unchanging, and snapshot() is O(1).
+
+    Because nodes are shared between versions, `parent` and the inorder
+    thread of TreeNode are not used here (they stay None).
+    """
+
+    def __init__(self, root: TreeNode = None, size: int = 0):
+        # Root and size live in one tuple, so a reader never pairs a new root
+        # with an old size.
+        self._version = (root, size)
+
+    def snapshot(self) -> 'PersistentBinarySearchTree':
+        """Return an independent handle on the current version in O(1).
+
+        Later updates of either handle do not affect the other, so a reader
+        can iterate a snapshot while a writer keeps updating the tree.
+        """
+        return PersistentBinarySearchTree(*self._version)
+
+    @property
+    def size(self) -> int:
+        """Return number of nodes contained in this version."""
+        return self._version[1]
+
+    def __len__(self) -> int:
+        return self._version[1]
+
+    def get_root(self) -> TreeNode:
+        return self._version[0]
+
+    def find(self, key: int) -> TreeNode:
+        """Return node with given key.
+
+        Raises:
+            ValueError: If key is None.
+            KeyError: If key is not present in the tree.
+        """
+        if key == None:
+            raise ValueError
+        node = self._version[0]
+        while node:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return node
+        raise KeyError(f"Key {key} not found in the tree.")
+
+    def __getitem__(self, key: int) -> Any:
+        return self.find(key).value
+
+    def insert(self, key: int, value: Any) -> None:
+        """Insert a new node, publishing a new version of the tree.
+
+        Raises:
+            ValueError: If key or value is None.
+            KeyError: If key is already present in the tree.
+        """
+        if key == None or value == None:
+            raise ValueError
+        path = []
+        node, size = self._version
+        while node:
+            if key < node.key:
+                path.append((node, True))
+                node = node.left
+            elif key > node.key:
+                path.append((node, False))
+                node = node.right
+            else:
+                raise KeyError(f"Key {key} already exists in the tree.")
+        self._version = (self._rebuild_path(path, TreeNode(key, value)), size + 1)
+
+    def remove(self, key: int) -> None:
+        """Remove node with given key, publishing a new version of the tree.
+
+        Raises:
+            ValueError: If key is None.
+            KeyError: If key is not present in the tree.
+        """
+        if key == None:
+            raise ValueError
+        path = []
+        node, size = self._version
+        while node and node.key != key:
+            if key < node.key:
+                path.append((node, True))
+                node = node.left
+            else:
+                path.append((node, False))
+                node = node.right
+        if not node:
+            raise KeyError(f"Key {key} not found in the tree.")
+
+        if not node.left:
+            replacement = node.right
+        elif not node.right:
+            replacement = node.left
+        else:
+            # Copy the path down to the successor; it takes the place of node.
+            successor_path = []
+            successor = node.right
+            while successor.left:
+                successor_path.append((successor, True))
+                successor = successor.left
+            right = self._rebuild_path(successor_path, successor.right)
+            replacement = self._balance(TreeNode(successor.key, successor.value, right=right, left=node.left))
+        self._version = (self._rebuild_path(path, replacement), size - 1)
+
+    def inorder(self) -> Generator[TreeNode, None, None]:
+        """Yield nodes of this version in inorder."""
+        stack = []
+        node = self._version[0]
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node
+            node = node.right
+
+    def __iter__(self) -> Generator[TreeNode, None, None]:
+        yield from self.inorder()
+
+    @property
+    def is_valid(self) -> bool:
+        """Return if the tree fulfills BST-criteria."""
+        stack = [(self._version[0], -float('inf'), float('inf'))]
+        while stack:
+            node, low, high = stack.pop()
+            if not node:
+                continue
+            if not (low < node.key < high):
+                return False
+            stack.append((node.left, low, node.key))
+            stack.append((node.right, node.key, high))
+        return True
+
+    def __repr__(self) -> str:
+        return f"PersistentBinarySearchTree({list(self.inorder())})"
+
+    ####################################################
+    # Helper Functions
+    ####################################################
+
+    @staticmethod
+    def _height(node: TreeNode) -> int:
+        return node.height if node else 0
+
+    @staticmethod
+    def _size_of(node: TreeNode) -> int:
+        return node.size if node else 0
+
+    def _update(self, node: TreeNode) -> None:
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+        node.size = 1 + self._size_of(node.left) + self._size_of(node.right)
+
+    @staticmethod
+    def _copy(node: TreeNode) -> TreeNode:
+        copy = TreeNode(node.key, node.value, right=node.right, left=node.left)
+        copy.height, copy.size = node.height, node.size
+        return copy
+
+    def _rebuild_path(self, path, child: TreeNode) -> TreeNode:
+        """Copy the nodes on path bottom-up, hanging child below the last one.
+
+        Args:
+            path: (node, went_left) pairs from the root downwards.
+            child: New subtree replacing the one the path ended in.
+
+        Returns:
+            TreeNode: Root of the new version.
+        """
+        for node, went_left in reversed(path):
+            copy = self._copy(node)
+            if went_left:
+                copy.left = child
+            else:
+                copy.right = child
+            child = self._balance(copy)
+        return child
+
+    def _balance(self, node: TreeNode) -> TreeNode:
+        """Restore the AVL-criterion at the fresh node and return the subtree root."""
+        self._update(node)
+        balance = self._height(node.left) - self._height(node.right)
+        if balance > 1:
+            if self._height(node.left.left) < self._height(node.left.right):
+                node.left = self._rotate_left(self._copy(node.left))
+            return self._rotate_right(node)
+        if balance < -1:
+            if self._height(node.right.right) < self._height(node.right.left):
+                node.right = self._rotate_right(self._copy(node.right))
+            return self._rotate_left(node)
+        return node
+
+    def _rotate_left(self, node: TreeNode) -> TreeNode:
+        """Rotate the fresh node to the left; its (shared) right child is copied first."""
+        pivot = self._copy(node.right)
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_right(self, node: TreeNode) -> TreeNode:
+        """Rotate the fresh node to the right; its (shared) left child is copied first."""
+        pivot = self._copy(node.left)
+        node.left = pivot.right
+        pivot.right = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
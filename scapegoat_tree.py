@@ -0,0 +1,323 @@
+from math import log
+from typing import Any, Generator, Iterable, List
+
+from bst import BinarySearchTree
+from monoid import Monoid
+from tree_node import TreeNode
+
+
+class ScapegoatNode(TreeNode):
+    """TreeNode with the tombstone flag of ScapegoatTree."""
+    __slots__ = ('deleted',)
+
+    def __init__(self, key: int, value: Any, right: TreeNode = None,
+                 left: TreeNode = None, parent: TreeNode = None):
+        super().__init__(key, value, right, left, parent)
+        self.deleted = False
+
+
+class AggregateScapegoatNode(ScapegoatNode):
+    """ScapegoatNode of a tree with a monoid."""
+    __slots__ = ('aggregate',)
+
+    def __init__(self, key: int, value: Any, right: TreeNode = None,
+                 left: TreeNode = None, parent: TreeNode = None):
+        super().__init__(key, value, right, left, parent)
+        self.aggregate = None
+
+
+class ScapegoatTree(BinarySearchTree):
+    """Scapegoat tree with lazy deletion.
+
+    remove only marks a node as deleted (a tombstone); lookups and traversals
+    skip tombstones. Nothing is ever rotated. Instead:
+
+    * an insert which lands deeper than log_{1/alpha}(nodes) rebuilds the
+      subtree of the first ancestor whose child holds more than alpha of its
+      nodes (the scapegoat) into a perfectly balanced shape, and
+    * once tombstones make up more than max_tombstone_ratio of all nodes, the
+      whole tree is rebuilt without them.
+
+    Both rebuilds are linear in the rebuilt subtree and amortize to O(log n)
+    per update, and the height stays O(log n).
+
+    Subtree sizes (TreeNode.size) count live nodes only, so select/rank stay
+    exact; heights describe the physical tree.
+    """
+
+    def __init__(self, root: TreeNode = None, alpha: float = 0.7, max_tombstone_ratio: float = 0.5,
+                 monoid: Monoid = None, bloom_error_rate: float = None, finger: bool = False):
+        """Initialize ScapegoatTree.
+
+        Args:
+            root (ScapegoatNode, optional): Root of the tree. Defaults to None.
+            alpha (float, optional): Balance factor, 0.5 < alpha < 1. Defaults to 0.7.
+            max_tombstone_ratio (float, optional): Share of tombstones which triggers
+                a full rebuild. Defaults to 0.5.
+            monoid (Monoid, optional): See BinarySearchTree. Defaults to None.
+            bloom_error_rate (float, optional): See BinarySearchTree. Defaults to None.
+            finger (bool, optional): See BinarySearchTree. Defaults to False.
+
+        Raises:
+            ValueError: If alpha or max_tombstone_ratio is out of range.
+        """
+        if not 0.5 < alpha < 1 or not 0 < max_tombstone_ratio < 1:
+            raise ValueError("alpha must be in (0.5, 1) and max_tombstone_ratio in (0, 1).")
+        super().__init__(root, monoid, bloom_error_rate, finger)
+        self._node_class = AggregateScapegoatNode if monoid else ScapegoatNode
+        self._alpha = alpha
+        self._max_tombstone_ratio = max_tombstone_ratio
+        self._tombstones = 0
+
+    @property
+    def tombstones(self) -> int:
+        """Return number of deleted nodes still linked into the tree."""
+        return self._tombstones
+
+    def find(self, key: int) -> TreeNode:
+        """Return the live node with given key.
+
+        Raises:
+            ValueError: If key is None.
+            KeyError: If key is not present (or deleted).
+        """
+        if key == None:
+            raise ValueError
+        if self._bloom is not None and key not in self._bloom:
+            raise KeyError(f"Key {key} not found in the tree.")
+        node = self._descend(key)[1]
+        if node and not node.deleted:
+            return node
+        raise KeyError(f"Key {key} not found in the tree.")
+
+    def get(self, key: int, default: Any = None) -> Any:
+        # Tombstones hold None, which is never the value of a live node.
+        value = super().get(key)
+        return default if value is None else value
+
+    def insert(self, key: int, value: Any) -> TreeNode:
+        """Insert a new node (reviving a tombstone with that key, if any).
+
+        Raises:
+            ValueError: If key or value is None.
+            KeyError: If key is already present in the tree.
+
+        Returns:
+            TreeNode: The inserted node.
+        """
+        if key == None or value == None:
+            raise ValueError
+        parent, node = self._descend(key)
+        if node:
+            if not node.deleted:
+                raise KeyError(f"Key {key} already exists in the tree.")
+            node.deleted = False
+            node.value = value
+            self._tombstones -= 1
+            self._link_live(node)
+            self._retrace(node)
+            self._bloom_add(key)
+            return node
+
+        node = self._node_class(key, value, parent=parent)
+        if not parent:
+            self._root = node
+        elif key < parent.key:
+            parent.left = node
+        else:
+            parent.right = node
+        self._link_live(node)
+        self._retrace(node)
+        self._bloom_add(key)
+
+        physical = self._size + self._tombstones
+        if node.depth > log(physical) / log(1 / self._alpha):
+            self._rebuild(self._find_scapegoat(node))
+        return node
+
+    def remove(self, key: int) -> None:
+        """Mark the node with given key as deleted.
+
+        Raises:
+            ValueError: If key is None.
+            KeyError: If key is not present in the tree.
+        """
+        if key == None:
+            raise ValueError
+        node = self._descend(key)[1]
+        if not node or node.deleted:
+            raise KeyError(f"Key {key} not found in the tree.")
+        return self.remove_node(node)
+
+    def remove_node(self, node: TreeNode) -> None:
+        """Mark a live node of this tree as deleted without searching for it.
+
+        Raises:
+            KeyError: If node is already deleted or detached.
+        """
+        if node.deleted or (node.parent is None and node is not self._root):
+            raise KeyError(f"Node with key {node.key} is not a live node of the tree.")
+        node.deleted = True
+        node.value = None
+        if node is self._min_node:
+            self._min_node = node.next_node
+        if node is self._max_node:
+            self._max_node = node.prev_node
+        self._unthread(node)
+        self._size -= 1
+        self._tombstones += 1
+        self._retrace(node)
+        if self._bloom is not None:
+            self._bloom.discard(node.key)
+
+        if self._tombstones > self._max_tombstone_ratio * (self._size + self._tombstones):
+            self._rebuild(self._root)
+        return True
+
+    def find_many(self, keys: Iterable[int], default: Any = None) -> List[Any]:
+        # Tombstones hold None, which is never the value of a live node.
+        return [default if value is None else value for value in super().find_many(keys, None)]
+
+    def range_items(self, lo: int, hi: int) -> Generator[TreeNode, None, None]:
+        for node in super().range_items(lo, hi):
+            if not node.deleted:
+                yield node
+
+    def ceiling(self, key: int) -> TreeNode:
+        node = super().ceiling(key)
+        while node and node.deleted:
+            node = self._physical_successor(node)
+        return node
+
+    def select(self, k: int) -> TreeNode:
+        """Return the live node with the k-th smallest key in O(height).
+
+        Raises:
+            IndexError: If k is not in range(size).
+        """
+        if not 0 <= k < self._size_of(self._root):
+            raise IndexError(f"Index {k} out of range.")
+        node = self._root
+        while True:
+            left_size = self._size_of(node.left)
+            own = 0 if node.deleted else 1
+            if k < left_size:
+                node = node.left
+            elif k < left_size + own:
+                return node
+            else:
+                k -= left_size + own
+                node = node.right
+
+    def rank(self, key: int) -> int:
+        """Return the number of live keys smaller than key in O(height)."""
+        if key == None:
+            raise ValueError
+        rank = 0
+        node = self._root
+        while node:
+            if key <= node.key:
+                node = node.left
+            else:
+                rank += self._size_of(node.left) + (0 if node.deleted else 1)
+                node = node.right
+        return rank
+
+    ####################################################
+    # Helper Functions
+    ####################################################
+
+    def _settings(self) -> dict:
+        settings = super()._settings()
+        settings.update(alpha=self._alpha, max_tombstone_ratio=self._max_tombstone_ratio)
+        return settings
+
+    def _lift(self, node: TreeNode) -> Any:
+        return self._monoid.identity if node.deleted else super()._lift(node)
+
+    def _update(self, node: TreeNode) -> None:
+        super()._update(node)
+        if node.deleted:
+            node.size -= 1
+
+    def _inorder(self, current_node):
+        for node in super()._inorder(current_node):
+            if not node.deleted:
+                yield node
+
+    def _preorder(self, current_node):
+        for node in super()._preorder(current_node):
+            if not node.deleted:
+                yield node
+
+    def _postorder(self, current_node):
+        for node in super()._postorder(current_node):
+            if not node.deleted:
+                yield node
+
+    @staticmethod
+    def _physical_successor(node: TreeNode) -> TreeNode:
+        """Return the inorder successor of node, tombstones included, via parent links."""
+        if node.right:
+            node = node.right
+            while node.left:
+                node = node.left
+            return node
+        while node.parent and node is node.parent.right:
+            node = node.parent
+        return node.parent
+
+    @staticmethod
+    def _physical_predecessor(node: TreeNode) -> TreeNode:
+        if node.left:
+            node = node.left
+            while node.right:
+                node = node.right
+            return node
+        while node.parent and node is node.parent.left:
+            node = node.parent
+        return node.parent
+
+    def _link_live(self, node: TreeNode) -> None:
+        """Thread a node which just became live between its live neighbours."""
+        prev_node = self._physical_predecessor(node)
+        while prev_node and prev_node.deleted:
+            prev_node = self._physical_predecessor(prev_node)
+        next_node = self._physical_successor(node)
+        while next_node and next_node.deleted:
+            next_node = self._physical_successor(next_node)
+        self._thread(node, prev_node, next_node)
+        if prev_node is None:
+            self._min_node = node
+        if next_node is None:
+            self._max_node = node
+        self._size += 1
+
+    def _physical_size(self, node: TreeNode) -> int:
+        return sum(1 for _ in super()._preorder(node))
+
+    def _find_scapegoat(self, node: TreeNode) -> TreeNode:
+        """Walk up from a too deep node to the first ancestor which is not alpha-weight-balanced."""
+        size = 1
+        while node.parent:
+            parent = node.parent
+            sibling = parent.right if node is parent.left else parent.left
+            parent_size = size + 1 + self._physical_size(sibling)
+            if size > self._alpha * parent_size:
+                return parent
+            node, size = parent, parent_size
+        return node
+
+    def _rebuild(self, subtree: TreeNode) -> None:
+        """Relink the live nodes below subtree into a perfectly balanced shape, dropping tombstones."""
+        if not subtree:
+            return
+        parent = subtree.parent
+        physical = list(super()._inorder(subtree))
+        nodes = [node for node in physical if not node.deleted]
+        self._tombstones -= len(physical) - len(nodes)
+        if self._finger is not None and self._finger.deleted:
+            # The tombstone the finger rests on may be dropped right now.
+            self._finger = None
+        self._replace_child(parent, subtree, self._link_balanced(nodes, parent))
+        self._retrace(parent)
@@ -0,0 +1,356 @@
+"""Key-range sharded front-end over trees living in worker processes."""
+import heapq
+import multiprocessing
+import os
+from bisect import bisect_right
+from random import Random
+from typing import Any, Generator, Iterable, List, Tuple
+
+from avl_tree import AVLTree
+from tree_node import TreeNode
+
+# Rebalancing is pointless while the whole tree is this small.
+MIN_REBALANCE_SIZE = 1024
+
+
+class _Shard:
+    """The tree of one key range, owned by a worker process.
+
+    Every public method is an operation the front-end can send through the pipe.
+    """
+
+    def __init__(self, tree_class: type, settings: dict):
+        self._tree_class = tree_class
+        self._settings = settings
+        self._tree = tree_class(**settings)
+        self._rng = Random()
+
+    def insert(self, key: int, value: Any) -> None:
+        self._tree.insert(key, value)
+
+    def find(self, key: int) -> Any:
+        return self._tree[key]
+
+    def get(self, key: int, default: Any) -> Any:
+        return self._tree.get(key, default)
+
+    def remove(self, key: int) -> None:
+        self._tree.remove(key)
+
+    def find_many(self, keys: List[int], default: Any) -> List[Any]:
+        return self._tree.find_many(keys, default)
+
+    def insert_many(self, pairs: List[Tuple[int, Any]]) -> List[int]:
+        """Insert pairs and return the keys which were present already."""
+        duplicates = []
+        for key, value in pairs:
+            try:
+                self._tree.insert(key, value)
+            except KeyError:
+                duplicates.append(key)
+        return duplicates
+
+    def size(self) -> int:
+        return self._tree.size
+
+    def sample(self, k: int) -> Tuple[int, List[int]]:
+        """Return the size of the tree and up to k keys drawn uniformly by rank."""
+        size = self._tree.size
+        ranks = sorted(self._rng.sample(range(size), min(k, size)))
+        return size, [self._tree.select(rank).key for rank in ranks]
+
+    def chunk(self, after: int, limit: int) -> List[Tuple[int, Any]]:
+        """Return up to limit pairs with keys > after (from the minimum if after is None)."""
+        cursor = self._tree.cursor(after)
+        if cursor.valid and cursor.key == after:
+            cursor.next()
+        pairs = []
+        while cursor.valid and len(pairs) < limit:
+            pairs.append((cursor.key, cursor.value))
+            cursor.next()
+        return pairs
+
+    def extract_outside(self, lo: int, hi: int) -> List[Tuple[int, Any]]:
+        """Keep only keys in [lo, hi) (a None bound is open) and return all other pairs."""
+        kept, moved = [], []
+        for node in self._tree.inorder():
+            inside = (lo is None or node.key >= lo) and (hi is None or node.key < hi)
+            (kept if inside else moved).append((node.key, node.value))
+        if moved:
+            self._tree = self._tree_class.from_sorted(kept, **self._settings)
+        return moved
+
+
+def _serve(conn, tree_class: type, settings: dict) -> None:
+    """Worker loop: answer (operation, args) messages until None arrives."""
+    shard = _Shard(tree_class, settings)
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        operation, args = message
+        try:
+            conn.send((True, getattr(shard, operation)(*args)))
+        except Exception as e:
+            conn.send((False, e))
+    conn.close()
+
+
+class ShardedBinarySearchTree:
+    """Splits the key space into ranges, each kept in a tree in its own worker process.
+
+    Shard i holds the keys in [boundaries[i - 1], boundaries[i]). Single
+    operations cost a pipe round trip to one worker. The batch operations
+    find_many and insert_many send every shard its part first and then
+    collect the answers, so the workers search in parallel on separate cores.
+    Boundaries start empty (everything in the first shard) and are moved to
+    sampled quantiles once a shard grows past max_imbalance times the mean.
+    Iteration merges the sorted streams of all shards.
+    """
+
+    def __init__(self, num_shards: int = None, tree_class: type = AVLTree, max_imbalance: float = 2.0,
+                 chunk_size: int = 4096, **settings):
+        """Initialize ShardedBinarySearchTree and start its workers.
+
+        Args:
+            num_shards (int, optional): Number of worker processes. Defaults to the number of CPUs.
+            tree_class (type, optional): Tree class used by the workers. Defaults to AVLTree.
+            max_imbalance (float, optional): Rebalance once a shard holds more than this
+                multiple of the mean shard size, capped at (num_shards + 1) / 2 so that
+                few shards still rebalance. Defaults to 2.0.
+            chunk_size (int, optional): Pairs fetched per round trip while iterating. Defaults to 4096.
+            **settings: Passed on to tree_class (e.g. monoid, bloom_error_rate).
+
+        Raises:
+            ValueError: If num_shards < 1 or max_imbalance <= 1.
+        """
+        num_shards = num_shards or os.cpu_count() or 1
+        if num_shards < 1 or max_imbalance <= 1:
+            raise ValueError("num_shards must be positive and max_imbalance greater than 1.")
+        self._boundaries = []
+        self._sizes = [0] * num_shards
+        self._max_imbalance = max_imbalance
+        self._chunk_size = chunk_size
+        self._connections = []
+        self._workers = []
+        for _ in range(num_shards):
+            parent_end, child_end = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=_serve, args=(child_end, tree_class, settings), daemon=True)
+            worker.start()
+            child_end.close()
+            self._connections.append(parent_end)
+            self._workers.append(worker)
+
+    @property
+    def num_shards(self) -> int:
+        return len(self._connections)
+
+    @property
+    def boundaries(self) -> List[int]:
+        """Return the smallest key of every shard but the first."""
+        return list(self._boundaries)
+
+    @property
+    def size(self) -> int:
+        """Return number of keys contained in all shards."""
+        return sum(self._sizes)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def close(self) -> None:
+        """Stop the workers; the keys are lost."""
+        for conn, worker in zip(self._connections, self._workers):
+            conn.send(None)
+            conn.close()
+            worker.join()
+        self._connections, self._workers = [], []
+
+    def __enter__(self) -> 'ShardedBinarySearchTree':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def insert(self, key: int, value: Any) -> None:
+        """Insert a new key into its shard.
+
+        Raises:
+            ValueError: If key or value is None.
+            KeyError: If key is already present in the tree.
+        """
+        if key == None or value == None:
+            raise ValueError
+        shard = self._shard_of(key)
+        self._call(shard, 'insert', key, value)
+        self._sizes[shard] += 1
+        self._check_balance()
+
+    def find(self, key: int) -> TreeNode:
+        """Return a detached node holding key and its value.
+
+        Raises:
+            ValueError: If key is None.
+            KeyError: If key is not present in the tree.
+        """
+        if key == None:
+            raise ValueError
+        return TreeNode(key, self._call(self._shard_of(key), 'find', key))
+
+    def __getitem__(self, key: int) -> Any:
+        return self.find(key).value
+
+    def get(self, key: int, default: Any = None) -> Any:
+        """Return value of key, or default if it is missing."""
+        if key == None:
+            raise ValueError
+        return self._call(self._shard_of(key), 'get', key, default)
+
+    def remove(self, key: int) -> None:
+        """Remove key from its shard.
+
+        Raises:
+            ValueError: If key is None.
+            KeyError: If key is not present in the tree.
+        """
+        if key == None:
+            raise ValueError
+        shard = self._shard_of(key)
+        self._call(shard, 'remove', key)
+        self._sizes[shard] -= 1
+
+    def find_many(self, keys: Iterable[int], default: Any = None) -> List[Any]:
+        """Return the values of many keys, looked up by all shards in parallel.
+
+        Raises:
+            ValueError: If a key is None.
+        """
+        keys = list(keys)
+        if any(key == None for key in keys):
+            raise ValueError
+        positions = [[] for _ in self._connections]
+        for i, key in enumerate(keys):
+            positions[self._shard_of(key)].append(i)
+        batches = {shard: [keys[i] for i in batch] for shard, batch in enumerate(positions) if batch}
+        results = [default] * len(keys)
+        for shard, values in self._scatter('find_many', {shard: (batch, default) for shard, batch in batches.items()}):
+            for i, value in zip(positions[shard], values):
+                results[i] = value
+        return results
+
+    def insert_many(self, pairs: Iterable[Tuple[int, Any]]) -> None:
+        """Insert many pairs, each shard inserting its part in parallel.
+
+        Raises:
+            ValueError: If a key or value is None.
+            KeyError: If keys were present already; all other pairs are inserted.
+        """
+        batches = {}
+        for key, value in pairs:
+            if key == None or value == None:
+                raise ValueError
+            batches.setdefault(self._shard_of(key), []).append((key, value))
+        duplicates = self._insert_batches(batches)
+        self._check_balance()
+        if duplicates:
+            raise KeyError(f"Keys {sorted(duplicates)} already exist in the tree.")
+
+    def items(self) -> Generator[Tuple[int, Any], None, None]:
+        """Yield all (key, value) pairs in key order, fetching chunk_size pairs per round trip."""
+        yield from heapq.merge(*(self._stream(shard) for shard in range(self.num_shards)),
+                               key=lambda pair: pair[0])
+
+    def __iter__(self) -> Generator[TreeNode, None, None]:
+        for key, value in self.items():
+            yield TreeNode(key, value)
+
+    def rebalance(self, sample_size: int = 256) -> None:
+        """Move the shard boundaries to quantiles of sampled keys and move the keys accordingly.
+
+        Every shard samples sample_size keys; a sample stands for size / sample_size
+        keys of its shard, so the new boundaries split the weighted samples evenly.
+        """
+        samples = self._scatter('sample', {shard: (sample_size,) for shard in range(self.num_shards)})
+        weighted = sorted((key, size / len(keys)) for _, (size, keys) in samples for key in keys)
+        if not weighted:
+            return
+        total = sum(weight for _, weight in weighted)
+        boundaries, seen = [], 0.0
+        for key, weight in weighted:
+            if len(boundaries) == self.num_shards - 1:
+                break
+            # The first key past the next quantile starts a new shard.
+            if seen >= total * (len(boundaries) + 1) / self.num_shards:
+                boundaries.append(key)
+            seen += weight
+        # Too few distinct samples: the remaining shards start at the largest one.
+        boundaries += [weighted[-1][0]] * (self.num_shards - 1 - len(boundaries))
+        self._boundaries = boundaries
+
+        bounds = [None] + boundaries + [None]
+        moved = self._scatter('extract_outside', {shard: (bounds[shard], bounds[shard + 1])
+                                                  for shard in range(self.num_shards)})
+        batches = {}
+        for shard, pairs in moved:
+            self._sizes[shard] -= len(pairs)
+            for key, value in pairs:
+                batches.setdefault(self._shard_of(key), []).append((key, value))
+        self._insert_batches(batches)
+
+    def __repr__(self) -> str:
+        return f"ShardedBinarySearchTree(sizes={self._sizes}, boundaries={self._boundaries})"
+
+    ####################################################
+    # Helper Functions
+    ####################################################
+
+    def _shard_of(self, key: int) -> int:
+        return bisect_right(self._boundaries, key)
+
+    def _receive(self, shard: int) -> Any:
+        ok, result = self._connections[shard].recv()
+        if not ok:
+            raise result
+        return result
+
+    def _call(self, shard: int, operation: str, *args) -> Any:
+        self._connections[shard].send((operation, args))
+        return self._receive(shard)
+
+    def _scatter(self, operation: str, args_by_shard: dict) -> List[Tuple[int, Any]]:
+        """Send operation to several shards at once, then collect (shard, result) pairs."""
+        for shard, args in args_by_shard.items():
+            self._connections[shard].send((operation, args))
+        # Collect every answer before raising, so no reply is left in a pipe.
+        answers = [(shard, self._connections[shard].recv()) for shard in args_by_shard]
+        for _, (ok, result) in answers:
+            if not ok:
+                raise result
+        return [(shard, result) for shard, (_, result) in answers]
+
+    def _insert_batches(self, batches: dict) -> List[int]:
+        """Insert {shard: pairs} in parallel and return the keys which were present already."""
+        duplicates = []
+        for shard, present in self._scatter('insert_many', {shard: (pairs,) for shard, pairs in batches.items()}):
+            self._sizes[shard] += len(batches[shard]) - len(present)
+            duplicates += present
+        return duplicates
+
+    def _stream(self, shard: int) -> Generator[Tuple[int, Any], None, None]:
+        after = None
+        while True:
+            pairs = self._call(shard, 'chunk', after, self._chunk_size)
+            yield from pairs
+            if len(pairs) < self._chunk_size:
+                return
+            after = pairs[-1][0]
+
+    def _check_balance(self) -> None:
+        total = sum(self._sizes)
+        if self.num_shards < 2 or total < MIN_REBALANCE_SIZE:
+            return
+        # No shard can exceed num_shards times the mean, so the threshold stays
+        # halfway below that (1.5 for two shards) to remain reachable.
+        threshold = min(self._max_imbalance, (self.num_shards + 1) / 2)
+        if max(self._sizes) > threshold * total / self.num_shards:
+            self.rebalance()
@@ -0,0 +1,82 @@
+from typing import Any
+
+from bst import BinarySearchTree
+from tree_node import TreeNode
+
+
+class SplayTree(BinarySearchTree):
+    """Self-adjusting Binary-Search-Tree.
+
+    Every access rotates the accessed node up to the root along its parent
+    links, so frequently used keys stay near the top. Single operations can
+    cost O(n), but any sequence of m operations costs O(m log n), and skewed
+    access patterns get much cheaper than that.
+    """
+
+    mutating_reads = True
+
+    def _splay(self, node: TreeNode) -> None:
+        """Rotate node up until it is the root."""
+        while node.parent:
+            parent = node.parent
+            grand = parent.parent
+            if grand is None:
+                # zig
+                self._rotate_up(node)
+            elif (node is parent.left) == (parent is grand.left):
+                # zig-zig: rotate the parent first
+                self._rotate_up(parent)
+                self._rotate_up(node)
+            else:
+                # zig-zag
+                self._rotate_up(node)
+                self._rotate_up(node)
+
+    def _rotate_up(self, node: TreeNode) -> None:
+        """Rotate node above its parent."""
+        if node is node.parent.left:
+            self._rotate_right(node.parent)
+        else:
+            self._rotate_left(node.parent)
+
+    def find(self, key: int) -> TreeNode:
+        """Return node with given key and splay it to the root.
+
+        On a miss the last node visited is splayed instead, unless the Bloom
+        filter rules the key out before the tree is touched.
+
+        Raises:
+            ValueError: If key is None.
+            KeyError: If key is not present in the tree.
+        """
+        node = self._splay_search(key)
+        if node:
+            return node
+        raise KeyError(f"Key {key} not found in the tree.")
+
+    def get(self, key: int, default: Any = None) -> Any:
+        """Return value of node with given key (or default), splaying like find."""
+        node = self._splay_search(key)
+        return node.value if node else default
+
+    def insert(self, key: int, value: Any) -> TreeNode:
+        """Insert a new node and splay it to the root."""
+        node = super().insert(key, value)
+        self._splay(node)
+        return node
+
+    def remove(self, key: int) -> None:
+        """Splay the node with key to the root, then remove it."""
+        self.find(key)
+        return super().remove(key)
+
+    def _splay_search(self, key: int) -> TreeNode:
+        """Return the node with key (or None) after splaying the last node visited."""
+        if key == None:
+            raise ValueError
+        if self._bloom is not None and key not in self._bloom:
+            return None
+        parent, node = self._descend(key)
+        if node or parent:
+            self._splay(node or parent)
+        return node
@@ -0,0 +1,66 @@
+from typing import Any
+
+from tree_node import TreeNode
+
+
+class TreeCursor:
+    """Bidirectional cursor over the nodes of a BinarySearchTree.
+
+    Steps follow the inorder thread of the nodes, so moving to the next or
+    previous key costs O(1). A cursor which walked off either end is invalid.
+    """
+
+    def __init__(self, node: TreeNode = None):
+        self._node = node
+
+    @property
+    def valid(self) -> bool:
+        """Return if the cursor points at a node."""
+        return self._node is not None
+
+    @property
+    def node(self) -> TreeNode:
+        return self._node
+
+    @property
+    def key(self) -> int:
+        """Return the key under the cursor.
+
+        Raises:
+            IndexError: If the cursor is invalid.
+        """
+        if self._node is None:
+            raise IndexError("Cursor is out of range.")
+        return self._node.key
+
+    @property
+    def value(self) -> Any:
+        """Return the value under the cursor.
+
+        Raises:
+            IndexError: If the cursor is invalid.
+        """
+        if self._node is None:
+            raise IndexError("Cursor is out of range.")
+        return self._node.value
+
+    def next(self) -> bool:
+        """Move to the next larger key and return if the cursor is still valid."""
+        if self._node is not None:
+            self._node = self._node.next_node
+        return self._node is not None
+
+    def prev(self) -> bool:
+        """Move to the next smaller key and return if the cursor is still valid."""
+        if self._node is not None:
+            self._node = self._node.prev_node
+        return self._node is not None
+
+    def __iter__(self):
+        """Yield the nodes from the cursor position onwards, advancing the cursor."""
+        while self._node is not None:
+            yield self._node
+            self._node = self._node.next_node
+
+    def __repr__(self) -> str:
+        return f"TreeCursor({self._node})"
@@ -2,6 +2,10 @@ from typing import Any
 
 
 class TreeNode:
+    # No per-node __dict__: a tree holds many nodes, each with the same fixed attributes.
+    # Fields only some trees need live in subclasses (AggregateTreeNode, ScapegoatNode).
+    __slots__ = ('key', 'value', 'right', 'left', 'parent', 'height', 'size', 'prev_node', 'next_node')
+
     def __init__(self, key: int, value: Any, right: 'TreeNode' = None,
                  left: 'TreeNode' = None, parent: 'TreeNode' = None):
         self.key = key
@@ -9,6 +13,13 @@ class TreeNode:
         self.right = right
         self.left = left
         self.parent = parent
+        # Height of the subtree rooted here (a leaf has height 1).
+        self.height = 1
+        # Number of nodes in the subtree rooted here.
+        self.size = 1
+        # Inorder predecessor and successor, kept by the tree.
+        self.prev_node = None
+        self.next_node = None
 
     def __repr__(self) -> str:
         return f"TreeNode({self.key}, {self.value})"
@@ -32,3 +43,14 @@ class TreeNode:
     def is_internal(self) -> bool:
         """Return if node is an internal node."""
         return self.left is not None or self.right is not None
+
+
+class AggregateTreeNode(TreeNode):
+    """TreeNode of a tree with a monoid (see BinarySearchTree)."""
+    __slots__ = ('aggregate',)
+
+    def __init__(self, key: int, value: Any, right: TreeNode = None,
+                 left: TreeNode = None, parent: TreeNode = None):
+        super().__init__(key, value, right, left, parent)
+        # Monoid aggregate of the subtree rooted here.
+        self.aggregate = None
@@ -0,0 +1,60 @@
+import unittest
+from random import sample
+
+from array_bst import ArrayBinarySearchTree
+from tree_node import TreeNode
+
+arr_list_1 = [5, 18, 1, 8, 14, 16, 13, 3]
+
+
+def create_array_bst_from_list(list_):
+    tree = ArrayBinarySearchTree()
+    for k in list_:
+        tree.insert(key=k, value=str(k))
+    return tree
+
+
+class TestArrayBinarySearchTree(unittest.TestCase):
+
+    def test_insert_and_find(self):
+        tree = create_array_bst_from_list(arr_list_1)
+        self.assertEqual(8, tree.size)
+        self.assertEqual(8, len(tree))
+        for k in arr_list_1:
+            self.assertEqual(str(k), tree[k])
+            self.assertEqual(k, tree.find(k).key)
+        self.assertIsInstance(tree.find(5), TreeNode)
+        with self.assertRaises(KeyError):
+            tree.find(2)
+        with self.assertRaises(KeyError):
+            tree.insert(key=1, value="1")
+        with self.assertRaises(ValueError):
+            tree.insert(key=None, value="1")
+
+    def test_inorder(self):
+        tree = create_array_bst_from_list(arr_list_1)
+        self.assertEqual(sorted(arr_list_1), [node.key for node in tree.inorder()])
+
+    def test_remove_reuses_slots(self):
+        keys = sample(range(10000), 1000)
+        tree = create_array_bst_from_list(keys)
+        for k in keys[:500]:
+            tree.remove(k)
+        self.assertTrue(tree.is_valid)
+        self.assertEqual(500, tree.size)
+        self.assertEqual(sorted(keys[500:]), [node.key for node in tree.inorder()])
+        self.assertNotIn(keys[0], tree)
+        for k in keys[:500]:
+            tree.insert(key=k, value=str(k))
+        self.assertEqual(1000, len(tree._keys), "Slots of removed nodes were not reused")
+        self.assertEqual(sorted(keys), [node.key for node in tree.inorder()])
+
+    def test_remove_non_existing_key(self):
+        tree = create_array_bst_from_list(arr_list_1)
+        with self.assertRaises(KeyError):
+            tree.remove(20)
+        self.assertEqual(8, tree.size)
+
+
+if __name__ == "__main__":
+    unittest.main()
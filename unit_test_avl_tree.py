@@ -0,0 +1,74 @@
+import unittest
+from random import sample
+
+from avl_tree import AVLTree
+from monoid import SUM
+
+
+def create_avl_from_list(list_):
+    tree = AVLTree()
+    for k in list_:
+        tree.insert(key=k, value=str(k))
+    return tree
+
+
+class TestAVLTree(unittest.TestCase):
+
+    def test_sorted_insert_stays_balanced(self):
+        tree = create_avl_from_list(range(1023))
+        self.assertTrue(tree.is_valid, "AVL tree violates BST-criteria after sorted insert")
+        self.assertTrue(tree.is_balanced, "AVL tree is out of balance after sorted insert")
+        self.assertEqual(10, tree.get_root().height)
+        self.assertEqual(1023, tree.size)
+        self.assertEqual(1023, tree.get_root().size)
+        self.assertEqual(700, tree.select(700).key)
+        self.assertEqual(700, tree.rank(700))
+
+    def test_find_and_inorder(self):
+        keys = sample(range(10000), 500)
+        tree = create_avl_from_list(keys)
+        for k in keys:
+            self.assertEqual(str(k), tree[k])
+        self.assertEqual(sorted(keys), [node.key for node in tree.inorder()])
+        with self.assertRaises(KeyError):
+            tree.find(10001)
+
+    def test_parent_pointers_after_rotation(self):
+        tree = create_avl_from_list([1, 2, 3])
+        root = tree.get_root()
+        self.assertEqual(2, root.key)
+        self.assertIsNone(root.parent)
+        self.assertIs(root, root.left.parent)
+        self.assertIs(root, root.right.parent)
+
+    def test_remove_stays_balanced(self):
+        keys = sample(range(5000), 1000)
+        tree = create_avl_from_list(keys)
+        for k in keys[:700]:
+            tree.remove(k)
+            self.assertTrue(tree.is_balanced, f"AVL tree is out of balance after removing key = {k}")
+        self.assertTrue(tree.is_valid)
+        self.assertEqual(300, tree.size)
+        self.assertEqual(sorted(keys[700:]), [node.key for node in tree.inorder()])
+        self.assertEqual(sorted(keys[700:]), [node.key for node in tree.cursor()])
+
+    def test_remove_all(self):
+        tree = create_avl_from_list(range(100))
+        for k in range(100):
+            tree.remove(k)
+        self.assertIsNone(tree.get_root())
+        self.assertEqual(0, tree.size)
+
+    def test_aggregate_after_rotations(self):
+        tree = AVLTree(monoid=SUM)
+        for k in range(1000):
+            tree.insert(key=k, value=k)
+        for k in sample(range(1000), 500):
+            tree.remove(k)
+        remaining = [node.key for node in tree.inorder()]
+        self.assertEqual(sum(remaining), tree.get_root().aggregate)
+        self.assertEqual(sum(k for k in remaining if 100 <= k < 700), tree.aggregate(100, 700))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,11 +9,14 @@ import unittest
 from datetime import date
 # helpful information about unittests in python
 # https://docs.python.org/3/library/unittest.html
-from random import randint
+from random import randint, shuffle
 import inspect
+import copy
+import pickle
 
 from tree_node import TreeNode
 from bst import BinarySearchTree
+from monoid import COUNT, MAX, MIN, SUM
 
 arr_list_1 = [5, 18, 1, 8, 14, 16, 13, 3]
 arr_list_2 = [10, 5, 12, 3]
@@ -615,5 +618,399 @@ class UnitTestTemplate(unittest.TestCase):
         res = bst.return_max_key().key
         self.assertEqual(18, res, f"ERROR: return_max_key returned wrong max key ({res}) but should be '9'")
 
+    def test_from_sorted(self):
+        bst = BinarySearchTree.from_sorted((k, str(k)) for k in range(1023))
+        self.assertTrue(bst.is_valid, "ERROR: from_sorted built an invalid tree: " + self.print_tree(bst._root))
+        self.assertEqual(1023, bst.size)
+        self.assertEqual(10, bst.get_root().height)
+        self.assertEqual(511, bst.get_root().key)
+        self.assertIsNone(bst.get_root().parent)
+        for node in bst.inorder():
+            for child in (node.left, node.right):
+                if child:
+                    self.assertIs(node, child.parent)
+        self.assertEqual("1000", bst[1000])
+
+    def test_from_sorted_unsorted_input(self):
+        bst = BinarySearchTree.from_sorted((k, str(k)) for k in arr_list_1)
+        self.assertTrue(bst.is_valid)
+        self.assertEqual(arr_list_1_inorder, [node.value for node in bst.inorder()])
+        with self.assertRaises(KeyError):
+            BinarySearchTree.from_sorted([(3, "3"), (1, "1"), (3, "3")])
+        with self.assertRaises(ValueError):
+            BinarySearchTree.from_sorted([(None, "1")])
+
+    def test_traversals_on_degenerate_tree(self):
+        bst = BinarySearchTree()
+        previous = None
+        for k in range(5000):
+            node = TreeNode(key=k, value=str(k), parent=previous)
+            if previous:
+                previous.right = node
+            else:
+                bst._root = node
+            previous = node
+        bst._size = 5000
+        self.assertEqual(list(range(5000)), [node.key for node in bst.inorder()])
+        self.assertEqual(list(range(5000)), [node.key for node in bst.preorder()])
+        self.assertEqual(list(range(4999, -1, -1)), [node.key for node in bst.postorder()])
+        self.assertTrue(bst.is_valid)
+
+    def test_range_items(self):
+        bst = create_bst_from_list(arr_list_1)  # [5, 18, 1, 8, 14, 16, 13, 3]
+        range_student = bst.range_items(3, 14)
+        self.assertTrue(inspect.isgenerator(range_student), "range_items does not yield a generator object!")
+        self.assertEqual([3, 5, 8, 13], [node.key for node in range_student])
+        self.assertEqual([], list(bst.range_items(19, 30)))
+        self.assertEqual([], list(bst.range_items(8, 8)))
+        self.assertEqual([1, 3, 5, 8, 13, 14, 16, 18], [node.key for node in bst.range_items(-5, 100)])
+        with self.assertRaises(ValueError):
+            list(bst.range_items(None, 5))
+
+    def test_count_range(self):
+        bst = create_bst_from_list(arr_list_1)
+        self.assertEqual(4, bst.count_range(3, 14))
+        self.assertEqual(1, bst.count_range(18, 19))
+        self.assertEqual(0, bst.count_range(9, 13))
+        self.assertEqual(0, BinarySearchTree().count_range(0, 10))
+
+    def test_select(self):
+        bst = create_bst_from_list(arr_list_1)
+        for k, value in enumerate(arr_list_1_inorder):
+            self.assertEqual(value, bst.select(k).value, f"ERROR: select({k}) returned wrong node")
+        with self.assertRaises(IndexError):
+            bst.select(8)
+        with self.assertRaises(IndexError):
+            bst.select(-1)
+
+    def test_rank(self):
+        bst = create_bst_from_list(arr_list_1)  # inorder: 1, 3, 5, 8, 13, 14, 16, 18
+        self.assertEqual(0, bst.rank(1))
+        self.assertEqual(2, bst.rank(5))
+        self.assertEqual(3, bst.rank(6))
+        self.assertEqual(8, bst.rank(100))
+        self.assertEqual(0, bst.rank(-100))
+
+    def test_subtree_size_after_remove(self):
+        bst = create_bst_from_list(arr_list_1)
+        for k in [5, 14, 8]:
+            bst.remove(k)
+        self.assertEqual(5, bst.get_root().size)
+        for node in bst.inorder():
+            expected = 1 + (node.left.size if node.left else 0) + (node.right.size if node.right else 0)
+            self.assertEqual(expected, node.size, f"ERROR: wrong subtree size for key = {node.key}")
+        self.assertEqual("16", bst.select(3).value)
+
+    def test_find_many(self):
+        bst = create_bst_from_list(arr_list_1)
+        probes = [16, 2, 5, 18, 5, 100, 1]
+        self.assertEqual(["16", None, "5", "18", "5", None, "1"], bst.find_many(probes))
+        self.assertEqual(["16", "-", "5"], bst.find_many([16, 2, 5], default="-"))
+        self.assertEqual([], bst.find_many([]))
+        self.assertEqual([None, None], BinarySearchTree().find_many([1, 2]))
+        with self.assertRaises(ValueError):
+            bst.find_many([1, None])
+
+    def test_merge(self):
+        bst_1 = create_bst_from_list(arr_list_1)
+        bst_2 = create_bst_from_list([0, 2, 4, 20])
+        merged = bst_1.merge(bst_2)
+        self.assertTrue(merged.is_valid)
+        self.assertEqual(12, merged.size)
+        self.assertEqual(sorted(arr_list_1 + [0, 2, 4, 20]), [node.key for node in merged.inorder()])
+        self.assertEqual(4, merged.get_root().height)
+        self.assertEqual(8, bst_1.size, "ERROR: merge modified the original tree")
+        with self.assertRaises(KeyError):
+            bst_1.merge(create_bst_from_list([3]))
+
+    def test_split_and_join(self):
+        bst = create_bst_from_list(arr_list_1)
+        left, right = bst.split(13)
+        self.assertEqual([1, 3, 5, 8], [node.key for node in left.inorder()])
+        self.assertEqual([13, 14, 16, 18], [node.key for node in right.inorder()])
+        self.assertTrue(left.is_valid and right.is_valid)
+        joined = BinarySearchTree.join(left, right)
+        self.assertEqual(arr_list_1_inorder, [node.value for node in joined.inorder()])
+        self.assertEqual(8, joined.size)
+        with self.assertRaises(ValueError):
+            BinarySearchTree.join(right, left)
+        empty, everything = bst.split(-1)
+        self.assertEqual(0, empty.size)
+        self.assertEqual(8, everything.size)
+
+    def assert_threads(self, bst):
+        nodes = list(bst.inorder())
+        for prev_node, next_node in zip(nodes, nodes[1:]):
+            self.assertIs(next_node, bst.successor(prev_node), f"ERROR: wrong successor of key = {prev_node.key}")
+            self.assertIs(prev_node, bst.predecessor(next_node), f"ERROR: wrong predecessor of key = {next_node.key}")
+        if nodes:
+            self.assertIsNone(bst.predecessor(nodes[0]))
+            self.assertIsNone(bst.successor(nodes[-1]))
+
+    def test_successor_predecessor(self):
+        bst = create_bst_from_list(arr_list_1)
+        self.assert_threads(bst)
+        for k in [5, 14, 3, 18]:
+            bst.remove(k)
+            self.assert_threads(bst)
+        bst.insert(key=4, value="4")
+        bst.insert(key=20, value="20")
+        self.assert_threads(bst)
+        self.assert_threads(BinarySearchTree.from_sorted((k, str(k)) for k in range(100)))
+
+    def test_cursor(self):
+        bst = create_bst_from_list(arr_list_1)  # inorder: 1, 3, 5, 8, 13, 14, 16, 18
+        cursor = bst.cursor(9)
+        self.assertEqual(13, cursor.key)
+        self.assertTrue(cursor.next())
+        self.assertEqual("14", cursor.value)
+        self.assertTrue(cursor.prev())
+        self.assertTrue(cursor.prev())
+        self.assertEqual(8, cursor.key)
+        self.assertEqual([8, 13, 14, 16, 18], [node.key for node in cursor])
+        self.assertFalse(cursor.valid)
+        with self.assertRaises(IndexError):
+            cursor.key
+        self.assertEqual(1, bst.cursor().key)
+        self.assertFalse(bst.cursor(19).valid)
+        self.assertEqual(3, bst.cursor(3).key)
+
+    def test_min_max_cache(self):
+        bst = create_bst_from_list(arr_list_1)
+        self.assertEqual(1, bst.return_min_key().key)
+        self.assertEqual(18, bst.return_max_key().key)
+        bst.insert(key=0, value="0")
+        bst.insert(key=30, value="30")
+        self.assertEqual(0, bst.return_min_key().key)
+        self.assertEqual(30, bst.return_max_key().key)
+        bst.remove(30)
+        bst.remove(0)
+        bst.remove(1)
+        self.assertEqual(3, bst.return_min_key().key)
+        self.assertEqual(18, bst.return_max_key().key)
+
+    def test_max_cache_after_two_children_remove(self):
+        bst = create_bst_from_list([5, 3, 8])
+        bst.remove(5)  # successor 8 is the maximum and takes the place of the root
+        self.assertEqual(8, bst.return_max_key().key)
+        self.assertIs(bst.get_root(), bst.return_max_key())
+
+    def test_remove_keeps_node_handles(self):
+        bst = create_bst_from_list(arr_list_1)  # [5, 18, 1, 8, 14, 16, 13, 3]
+        handles = {k: bst.find(k) for k in arr_list_1}
+        bst.remove(5)  # two children, successor 8 is relinked into the root position
+        bst.remove(14)  # two children, successor 16 is a direct child
+        for k, node in handles.items():
+            if k not in (5, 14):
+                self.assertEqual(k, node.key, f"ERROR: handle of key = {k} changed its key")
+                self.assertIs(node, bst.find(k))
+        self.assertIs(handles[8], bst.get_root())
+        self.assertIsNone(handles[5].parent)
+        self.assertTrue(bst.is_valid, "Incorrect tree after remove: " + self.print_tree(bst._root))
+        self.assertEqual(["1", "3", "8", "13", "16", "18"], [node.value for node in bst.inorder()])
+
+    def test_remove_node(self):
+        bst = create_bst_from_list(arr_list_1)
+        for k in [8, 5, 18, 3]:
+            bst.remove_node(bst.find(k))
+            self.assertTrue(bst.is_valid, f"Incorrect tree after remove_node({k}): " + self.print_tree(bst._root))
+        self.assertEqual(4, bst.size)
+        self.assertEqual([1, 13, 14, 16], [node.key for node in bst.inorder()])
+        self.assertEqual([1, 13, 14, 16], [node.key for node in bst.cursor()])
+        for node in bst.inorder():
+            expected = 1 + (node.left.size if node.left else 0) + (node.right.size if node.right else 0)
+            self.assertEqual(expected, node.size)
+
+    def test_remove_node_rejects_stale_handle(self):
+        bst = create_bst_from_list(arr_list_1)
+        node = bst.find(3)
+        bst.remove(3)
+        with self.assertRaises(KeyError):
+            bst.remove_node(node)
+        self.assertEqual(7, bst.size)
+        self.assertEqual(7, len(list(bst.inorder())))
+        self.assertTrue(bst.is_valid)
+
+    def test_pop_min_pop_max(self):
+        bst = create_bst_from_list(arr_list_1)
+        self.assertEqual(1, bst.pop_min().key)
+        self.assertEqual(18, bst.pop_max().key)
+        self.assertEqual(6, bst.size)
+        self.assertEqual(["3", "16", "5", "14", "8", "13"],
+                         [bst.pop_min().value if i % 2 == 0 else bst.pop_max().value for i in range(6)])
+        self.assertIsNone(bst.pop_min())
+        self.assertIsNone(bst.pop_max())
+        self.assertIsNone(bst.return_min_key())
+        self.assertIsNone(bst.get_root())
+
+    def test_instrumentation_counters(self):
+        bst = create_bst_from_list(arr_list_1)
+        self.assertFalse(bst.instrumented)
+        bst.find(16)
+        self.assertEqual(0, bst.counters()['operations'], "ERROR: counters changed while instrumentation was off")
+        bst.enable_instrumentation()
+        bst.find(16)  # 5 -> 18 -> 8 -> 14 -> 16
+        counters = bst.counters()
+        self.assertEqual(1, counters['operations'])
+        self.assertEqual(5, counters['node_visits'])
+        self.assertEqual(9, counters['comparisons'])
+        bst.insert(key=2, value="2")
+        with self.assertRaises(KeyError):
+            bst.find(4)
+        self.assertEqual(3, bst.counters()['operations'])
+        bst.disable_instrumentation()
+        bst.remove(2)
+        self.assertEqual(3, bst.counters()['operations'])
+        bst.reset_counters()
+        self.assertEqual(0, bst.counters()['comparisons'])
+
+    def test_stats(self):
+        bst = create_bst_from_list(arr_list_1)
+        stats = bst.stats()
+        self.assertEqual(8, stats['size'])
+        self.assertEqual(5, stats['height'])
+        self.assertEqual([1, 2, 2, 1, 2], stats['depth_histogram'])
+        self.assertAlmostEqual(sum(bst.find(k).depth for k in arr_list_1) / 8, stats['mean_depth'])
+        self.assertAlmostEqual(5 / 4, stats['balance'])
+        self.assertEqual(1.0, BinarySearchTree.from_sorted((k, k) for k in range(127)).stats()['balance'])
+        self.assertEqual(0, BinarySearchTree().stats()['height'])
+
+    def test_aggregate(self):
+        keys = [randint(-1000, 1000) for _ in range(300)]
+        trees = {monoid: BinarySearchTree(monoid=monoid) for monoid in (SUM, MIN, MAX, COUNT)}
+        for tree in trees.values():
+            for k in set(keys):
+                tree.insert(key=k, value=k * 3)
+            for k in list(set(keys))[::3]:
+                tree.remove(k)
+        values = {node.key: node.value for node in trees[SUM].inorder()}
+        for _ in range(200):
+            lo, hi = sorted((randint(-1100, 1100), randint(-1100, 1100)))
+            in_range = [v for k, v in values.items() if lo <= k < hi]
+            self.assertEqual(sum(in_range), trees[SUM].aggregate(lo, hi))
+            self.assertEqual(min(in_range, default=float('inf')), trees[MIN].aggregate(lo, hi))
+            self.assertEqual(max(in_range, default=-float('inf')), trees[MAX].aggregate(lo, hi))
+            self.assertEqual(len(in_range), trees[COUNT].aggregate(lo, hi))
+
+    def test_node_classes(self):
+        plain = create_bst_from_list(arr_list_1)
+        self.assertFalse(hasattr(plain.get_root(), 'aggregate'))
+        with self.assertRaises(AttributeError):
+            plain.get_root().deleted = True
+        summed = BinarySearchTree(monoid=SUM)
+        summed.insert(key=1, value=5)
+        self.assertEqual(5, summed.get_root().aggregate)
+        self.assertEqual(5, copy.copy(summed).get_root().aggregate)
+
+    def test_aggregate_settings_survive_rebuilds(self):
+        bst = BinarySearchTree.from_sorted(((k, k) for k in range(100)), monoid=SUM)
+        self.assertEqual(sum(range(10, 20)), bst.aggregate(10, 20))
+        left, right = bst.split(50)
+        self.assertEqual(sum(range(50, 100)), right.aggregate(0, 1000))
+        self.assertEqual(sum(range(100)), BinarySearchTree.join(left, right).aggregate(0, 100))
+        with self.assertRaises(ValueError):
+            create_bst_from_list(arr_list_1).aggregate(0, 10)
+
+    def test_bloom_filter(self):
+        bst = BinarySearchTree(bloom_error_rate=0.01)
+        keys = list(range(0, 6000, 3))
+        shuffle(keys)
+        for k in keys:
+            bst.insert(key=k, value=str(k))
+        for k in keys[::2]:
+            bst.remove(k)
+        live = set(keys[1::2])
+        self.assertEqual(len(live), len(bst._bloom))
+        for k in range(6000):
+            self.assertEqual(str(k) if k in live else "-", bst.get(k, "-"))
+            if k in live:
+                self.assertEqual(str(k), bst[k])
+            else:
+                with self.assertRaises(KeyError):
+                    bst.find(k)
+        false_positives = sum(1 for k in range(6000) if k not in live and k in bst._bloom)
+        self.assertLess(false_positives, 0.05 * 6000)
+        self.assertEqual(0.01, bst.split(3000)[1]._bloom.error_rate)
+        self.assertIsNone(create_bst_from_list(arr_list_1)._bloom)
+        self.assertEqual("18", create_bst_from_list(arr_list_1).get(18))
+
+    def test_finger_search(self):
+        bst = BinarySearchTree(finger=True)
+        keys = list(range(2000))
+        shuffle(keys)
+        for k in keys:
+            bst.insert(key=k, value=str(k))
+        expected = {k: str(k) for k in keys}
+        for k in keys[:1000]:
+            bst.remove(k)
+            del expected[k]
+        for k in range(-5, 2005):
+            self.assertEqual(expected.get(k, "-"), bst.get(k, "-"))
+            if k in expected:
+                self.assertIs(bst.find(k), bst._finger)
+        for k in keys[:500]:
+            bst.insert(key=k, value=k)
+        self.assertTrue(bst.is_valid)
+        self.assertEqual(1500, len([bst[k] for k in range(2000) if bst.get(k) is not None]))
+        self.assertTrue(bst.split(1000)[1]._finger_search)
+
+    def test_finger_search_sequential_is_cheaper(self):
+        plain = BinarySearchTree.from_sorted((k, k) for k in range(4096))
+        finger = BinarySearchTree.from_sorted(((k, k) for k in range(4096)), finger=True)
+        for bst in (plain, finger):
+            bst.enable_instrumentation()
+            for k in range(4096):
+                bst.find(k)
+        self.assertTrue(finger.instrumented)
+        self.assertLess(finger.counters()['comparisons'], plain.counters()['comparisons'] / 3)
+        finger.disable_instrumentation()
+        self.assertFalse(finger.instrumented)
+        self.assertEqual(finger._finger_descend, finger._descend)
+
+    def test_pickle_and_copy_deep_tree(self):
+        bst = BinarySearchTree()
+        previous = None
+        for k in range(20000):
+            node = TreeNode(key=k, value=str(k), parent=previous)
+            if previous:
+                previous.right = node
+            else:
+                bst._root = node
+            previous = node
+        bst._size = 20000
+        for clone in (pickle.loads(pickle.dumps(bst)), copy.copy(bst), copy.deepcopy(bst)):
+            self.assertIsInstance(clone, BinarySearchTree)
+            self.assertTrue(clone.is_valid)
+            self.assertEqual(15, clone.get_root().height)
+            self.assertEqual([str(k) for k in range(20000)], [node.value for node in clone.inorder()])
+            clone.remove(5)
+            self.assertEqual("5", bst[5])
+        self.assertEqual(0, pickle.loads(pickle.dumps(BinarySearchTree())).size)
+
+    def test_copy_keeps_settings(self):
+        bst = BinarySearchTree(monoid=SUM, bloom_error_rate=0.01, finger=True)
+        for k in range(100):
+            bst.insert(key=k, value=k)
+        for clone in (pickle.loads(pickle.dumps(bst)), copy.copy(bst), copy.deepcopy(bst)):
+            self.assertEqual(sum(range(10, 20)), clone.aggregate(10, 20))
+            self.assertIsNotNone(clone._bloom)
+            self.assertEqual(5, clone.get(5))
+            self.assertTrue(clone._finger_search)
+
+    def test_deepcopy_values(self):
+        bst = BinarySearchTree()
+        bst.insert(key=1, value=[1, 2])
+        bst.insert(key=2, value=bst)
+        shallow, deep = copy.copy(bst), copy.deepcopy(bst)
+        self.assertIs(bst[1], shallow[1])
+        self.assertIsNot(bst[1], deep[1])
+        self.assertEqual([1, 2], deep[1])
+        self.assertIs(deep, deep[2])
+
+    def test_from_sorted_empty(self):
+        bst = BinarySearchTree.from_sorted([])
+        self.assertIsNone(bst.get_root())
+        self.assertEqual(0, bst.size)
+
 if __name__ == "__main__":
     unittest.main()
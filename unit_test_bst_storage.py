@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+
+from bst import BinarySearchTree
+from bst_storage import MappedBinarySearchTree
+
+
+class TestBSTStorage(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".bst")
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_dump_and_load(self):
+        bst = BinarySearchTree()
+        for k in [5, 18, 1, 8, 14, 16, 13, 3, -2 ** 40]:
+            bst.insert(key=k, value={"key": k, "text": str(k) * k if k > 0 else ""})
+        bst.dump(self.path)
+        loaded = BinarySearchTree.load(self.path)
+        self.assertEqual(9, loaded.size)
+        self.assertTrue(loaded.is_valid)
+        self.assertEqual(4, loaded.get_root().height)
+        self.assertEqual([(node.key, node.value) for node in bst.inorder()],
+                         [(node.key, node.value) for node in loaded.inorder()])
+
+    def test_load_empty(self):
+        BinarySearchTree().dump(self.path)
+        loaded = BinarySearchTree.load(self.path)
+        self.assertEqual(0, loaded.size)
+        self.assertIsNone(loaded.get_root())
+
+    def test_load_lazy(self):
+        BinarySearchTree.from_sorted((k, str(k)) for k in range(0, 2000, 2)).dump(self.path)
+        with BinarySearchTree.load(self.path, lazy=True) as mapped:
+            self.assertIsInstance(mapped, MappedBinarySearchTree)
+            self.assertEqual(1000, mapped.size)
+            self.assertEqual("1000", mapped[1000])
+            self.assertEqual(1998, mapped.find(1998).key)
+            with self.assertRaises(KeyError):
+                mapped.find(1001)
+            with self.assertRaises(KeyError):
+                mapped.find(5000)
+            self.assertEqual(list(range(0, 2000, 2)), [node.key for node in mapped.inorder()])
+
+    def test_load_rejects_other_files(self):
+        with open(self.path, 'wb') as fp:
+            fp.write(b"not a tree dump at all")
+        with self.assertRaises(ValueError):
+            BinarySearchTree.load(self.path)
+
+    def test_load_rejects_short_files(self):
+        BinarySearchTree.from_sorted((k, k) for k in range(10)).dump(self.path)
+        with open(self.path, 'rb') as fp:
+            data = fp.read()
+        for length in (0, 7, 16, 100):
+            with open(self.path, 'wb') as fp:
+                fp.write(data[:length])
+            with self.assertRaises(ValueError):
+                BinarySearchTree.load(self.path)
+            if length:
+                with self.assertRaises(ValueError):
+                    BinarySearchTree.load(self.path, lazy=True)
+
+    def test_load_lazy_rejects_settings(self):
+        BinarySearchTree().dump(self.path)
+        with self.assertRaises(ValueError):
+            BinarySearchTree.load(self.path, lazy=True, bloom_error_rate=0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+from random import Random
+
+from btree import BTree
+
+
+def create_btree_from_list(list_, **kwargs):
+    tree = BTree(**kwargs)
+    for k in list_:
+        tree.insert(key=k, value=str(k))
+    return tree
+
+
+class TestBTree(unittest.TestCase):
+
+    def test_insert_find(self):
+        keys = Random(1).sample(range(100000), 5000)
+        tree = create_btree_from_list(keys, fanout=8)
+        self.assertEqual(5000, tree.size)
+        self.assertTrue(tree.is_valid)
+        for k in keys:
+            self.assertEqual(str(k), tree[k])
+        with self.assertRaises(KeyError):
+            tree.find(100001)
+        with self.assertRaises(KeyError):
+            tree.insert(key=keys[0], value="x")
+        with self.assertRaises(ValueError):
+            tree.insert(key=None, value="x")
+        self.assertEqual(5000, tree.size)
+        self.assertTrue(tree.is_valid)
+
+    def test_sorted_insert_is_shallow(self):
+        tree = create_btree_from_list(range(10000), fanout=64)
+        self.assertEqual(list(range(10000)), [node.key for node in tree.inorder()])
+        self.assertLessEqual(tree.height, 3)
+        self.assertTrue(tree.is_valid)
+
+    def test_remove(self):
+        rng = Random(2)
+        keys = rng.sample(range(100000), 3000)
+        tree = create_btree_from_list(keys, fanout=4)
+        rng.shuffle(keys)
+        for n, k in enumerate(keys[:2500]):
+            tree.remove(k)
+            if n % 100 == 0:
+                self.assertTrue(tree.is_valid, f"Invalid B-tree after removing key = {k}")
+        self.assertEqual(500, tree.size)
+        self.assertEqual(sorted(keys[2500:]), [node.key for node in tree.inorder()])
+        with self.assertRaises(KeyError):
+            tree.remove(keys[0])
+        self.assertTrue(tree.is_valid)
+        for k in keys[2500:]:
+            tree.remove(k)
+        self.assertEqual(0, tree.size)
+        self.assertEqual([], list(tree.inorder()))
+
+    def test_odd_fanout(self):
+        with self.assertRaises(ValueError):
+            BTree(fanout=5)
+
+    def test_page_file(self):
+        handle, path = tempfile.mkstemp(suffix=".btree")
+        os.close(handle)
+        os.remove(path)
+        try:
+            keys = Random(3).sample(range(100000), 3000)
+            with create_btree_from_list(keys, fanout=16, path=path, page_size=1024, cache_pages=8) as tree:
+                for k in keys[:1000]:
+                    tree.remove(k)
+                self.assertTrue(tree.is_valid)
+            with BTree(path=path, cache_pages=8) as tree:
+                self.assertEqual(2000, tree.size)
+                self.assertEqual(16, tree.fanout)
+                self.assertEqual(sorted(keys[1000:]), [node.key for node in tree.inorder()])
+                self.assertEqual(str(keys[-1]), tree[keys[-1]])
+                tree.insert(key=-1, value="-1")
+            with BTree(path=path) as tree:
+                self.assertEqual("-1", tree[-1])
+                self.assertEqual(2001, tree.size)
+        finally:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
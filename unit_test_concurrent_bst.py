@@ -0,0 +1,108 @@
+import sys
+import threading
+import unittest
+from random import Random
+
+from avl_tree import AVLTree
+from concurrent_bst import ConcurrentBinarySearchTree, ReadWriteLock
+from splay_tree import SplayTree
+
+
+class TestConcurrentBinarySearchTree(unittest.TestCase):
+
+    def test_parallel_writers_and_readers(self):
+        tree = ConcurrentBinarySearchTree(AVLTree())
+        errors = []
+
+        def writer(offset):
+            for k in range(offset, 4000, 4):
+                tree.insert(key=k, value=str(k))
+            for k in range(offset, 2000, 4):
+                tree.remove(k)
+
+        def reader():
+            try:
+                for _ in range(200):
+                    keys = [node.key for node in tree.inorder()]
+                    if keys != sorted(keys):
+                        errors.append("torn iteration")
+                    tree.find_many(range(0, 4000, 97))
+            except Exception as e:
+                errors.append(repr(e))
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(4)]
+        threads += [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
+        self.assertEqual(2000, tree.size)
+        self.assertTrue(tree.is_valid)
+        self.assertEqual(list(range(2000, 4000)), [node.key for node in tree.inorder()])
+
+    def test_parallel_finds_on_splay_tree(self):
+        tree = ConcurrentBinarySearchTree(SplayTree())
+        for k in Random(1).sample(range(2000), 2000):
+            tree.insert(key=k, value=k)
+        errors = []
+
+        def reader(seed):
+            rng = Random(seed)
+            try:
+                for _ in range(10000):
+                    k = rng.randrange(2000)
+                    if tree.find(k).value != k or tree.get(k) != k:
+                        errors.append(f"wrong value for {k}")
+            except Exception as e:
+                errors.append(repr(e))
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=reader, args=(i,)) for i in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual([], errors[:5])
+        self.assertTrue(tree.is_valid)
+        self.assertEqual(list(range(2000)), [node.key for node in tree.inorder()])
+
+    def test_readers_share_the_lock(self):
+        lock = ReadWriteLock()
+        both_inside = threading.Barrier(2, timeout=5)
+
+        def reader():
+            with lock.read_locked():
+                both_inside.wait()
+
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertFalse(both_inside.broken, "Readers did not hold the lock at the same time")
+
+    def test_writer_excludes_readers(self):
+        lock = ReadWriteLock()
+        lock.acquire_write()
+        entered = threading.Event()
+
+        def reader():
+            with lock.read_locked():
+                entered.set()
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        self.assertFalse(entered.wait(0.1), "Reader entered while a writer held the lock")
+        lock.release_write()
+        thread.join()
+        self.assertTrue(entered.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
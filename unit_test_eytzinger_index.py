@@ -0,0 +1,55 @@
+import unittest
+from random import Random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from bst import BinarySearchTree
+from scapegoat_tree import ScapegoatTree
+
+
+@unittest.skipIf(np is None, "EytzingerIndex needs NumPy")
+class TestEytzingerIndex(unittest.TestCase):
+
+    def test_search_batch_all_sizes(self):
+        rng = Random(6)
+        for n in list(range(20)) + [31, 32, 33, 1000]:
+            keys = rng.sample(range(-5000, 5000), n)
+            index = BinarySearchTree.from_sorted((k, str(k)) for k in keys).freeze()
+            self.assertEqual(n, len(index))
+            probes = list(range(-5010, 5010, 7)) + keys
+            expected = [str(k) if k in keys else "-" for k in probes]
+            self.assertEqual(expected, list(index.search_batch(np.array(probes), default="-")))
+
+    def test_freeze_is_a_snapshot(self):
+        tree = ScapegoatTree()
+        for k in range(100):
+            tree.insert(key=k, value=k * k)
+        tree.remove(50)
+        index = tree.freeze()
+        tree.insert(key=500, value=0)
+        self.assertEqual([None, 49 * 49, None], list(index.search_batch([50, 49, 500])))
+        self.assertEqual(81, index.get(9))
+        self.assertEqual(-1, index.get(-9, -1))
+
+    def test_extreme_keys(self):
+        low, high = np.iinfo(np.int64).min, np.iinfo(np.int64).max
+        index = BinarySearchTree.from_sorted([(low, "low"), (0, "zero"), (high, "high")]).freeze()
+        self.assertEqual(["low", "zero", "high", None], list(index.search_batch([low, 0, high, 1])))
+        self.assertEqual([None], list(BinarySearchTree().freeze().search_batch([1])))
+
+    def test_non_integer_probes(self):
+        index = BinarySearchTree.from_sorted([(1, "one"), (2, "two")]).freeze()
+        self.assertEqual(["one", "two"], list(index.search_batch([1.0, np.int32(2)])))
+        for probes in ([1.5], np.array([2.5]), ["1"], [2 ** 70]):
+            with self.assertRaises(ValueError):
+                index.search_batch(probes)
+        with self.assertRaises(ValueError):
+            BinarySearchTree.from_sorted([(0.5, "half")]).freeze()
+        self.assertEqual(0, len(index.search_batch([])))
+
+
+if __name__ == "__main__":
+    unittest.main()
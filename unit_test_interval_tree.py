@@ -0,0 +1,72 @@
+import copy
+import pickle
+import unittest
+from random import Random
+
+from interval_tree import IntervalTree
+
+
+def brute_force(intervals, a, b):
+    return sorted((s, e) for s, e in intervals if s <= b and e >= a)
+
+
+class TestIntervalTree(unittest.TestCase):
+
+    def setUp(self):
+        rng = Random(4)
+        self.intervals = set()
+        while len(self.intervals) < 2000:
+            start = rng.randint(0, 100000)
+            self.intervals.add((start, start + rng.randint(0, 500)))
+        self.tree = IntervalTree()
+        for start, end in self.intervals:
+            self.tree.insert_interval(start, end, value=f"{start}-{end}")
+
+    def test_overlapping(self):
+        rng = Random(5)
+        for _ in range(200):
+            a = rng.randint(-100, 100600)
+            b = a + rng.randint(0, 300)
+            self.assertEqual(brute_force(self.intervals, a, b), [node.key for node in self.tree.overlapping(a, b)])
+            self.assertEqual(brute_force(self.intervals, a, a), [node.key for node in self.tree.overlapping(a)])
+
+    def test_remove_interval(self):
+        removed = sorted(self.intervals)[::2]
+        for start, end in removed:
+            self.tree.remove_interval(start, end)
+        remaining = self.intervals.difference(removed)
+        self.assertTrue(self.tree.is_balanced)
+        self.assertEqual(max(e for s, e in remaining), self.tree.get_root().aggregate)
+        for a in range(0, 100000, 997):
+            self.assertEqual(brute_force(remaining, a, a + 50), [node.key for node in self.tree.overlapping(a, a + 50)])
+        with self.assertRaises(KeyError):
+            self.tree.remove_interval(*removed[0])
+
+    def test_shared_start_and_touching_bounds(self):
+        tree = IntervalTree()
+        tree.insert_interval(5, 10, "a")
+        tree.insert_interval(5, 7, "b")
+        tree.insert_interval(10, 12, "c")
+        self.assertEqual(["b", "a", "c"], [node.value for node in tree.overlapping(7, 10)])
+        self.assertEqual(["a", "c"], [node.value for node in tree.overlapping(10)])
+        self.assertEqual([], list(tree.overlapping(13, 20)))
+        with self.assertRaises(KeyError):
+            tree.insert_interval(5, 7, "d")
+        with self.assertRaises(ValueError):
+            tree.insert_interval(8, 3, "e")
+
+    def test_pickle_and_copy(self):
+        for clone in (pickle.loads(pickle.dumps(self.tree)), copy.deepcopy(self.tree)):
+            self.assertIsInstance(clone, IntervalTree)
+            self.assertEqual(brute_force(self.intervals, 500, 900), [node.key for node in clone.overlapping(500, 900)])
+
+    def test_from_sorted(self):
+        tree = IntervalTree.from_sorted(((s, e), s) for s, e in self.intervals)
+        self.assertEqual(brute_force(self.intervals, 500, 900), [node.key for node in tree.overlapping(500, 900)])
+        left, right = tree.split((50000, 0))
+        self.assertEqual(brute_force([i for i in self.intervals if i[0] >= 50000], 49000, 51000),
+                         [node.key for node in right.overlapping(49000, 51000)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from random import sample
+
+from persistent_bst import PersistentBinarySearchTree
+
+
+def create_persistent_bst_from_list(list_):
+    tree = PersistentBinarySearchTree()
+    for k in list_:
+        tree.insert(key=k, value=str(k))
+    return tree
+
+
+def keys_and_values(tree):
+    return [(node.key, node.value) for node in tree.inorder()]
+
+
+class TestPersistentBinarySearchTree(unittest.TestCase):
+
+    def test_insert_find(self):
+        keys = sample(range(10000), 500)
+        tree = create_persistent_bst_from_list(keys)
+        self.assertEqual(500, tree.size)
+        self.assertTrue(tree.is_valid)
+        for k in keys:
+            self.assertEqual(str(k), tree[k])
+        with self.assertRaises(KeyError):
+            tree.insert(key=keys[0], value="x")
+        with self.assertRaises(KeyError):
+            tree.find(10001)
+
+    def test_sorted_insert_stays_balanced(self):
+        tree = create_persistent_bst_from_list(range(1023))
+        self.assertEqual(10, tree.get_root().height)
+        self.assertEqual(1023, tree.get_root().size)
+
+    def test_snapshot_is_unaffected_by_updates(self):
+        keys = sample(range(1000), 300)
+        tree = create_persistent_bst_from_list(keys)
+        snapshot = tree.snapshot()
+        before = keys_and_values(snapshot)
+        for k in keys[:200]:
+            tree.remove(k)
+        for k in range(1000, 1100):
+            tree.insert(key=k, value=str(k))
+        self.assertEqual(before, keys_and_values(snapshot))
+        self.assertEqual(300, snapshot.size)
+        self.assertEqual(sorted(keys[200:]) + list(range(1000, 1100)), [k for k, _ in keys_and_values(tree)])
+        self.assertTrue(tree.is_valid)
+
+    def test_snapshot_can_be_updated_independently(self):
+        tree = create_persistent_bst_from_list([5, 18, 1, 8])
+        snapshot = tree.snapshot()
+        snapshot.insert(key=3, value="3")
+        tree.remove(5)
+        self.assertEqual([1, 3, 5, 8, 18], [k for k, _ in keys_and_values(snapshot)])
+        self.assertEqual([1, 8, 18], [k for k, _ in keys_and_values(tree)])
+
+    def test_iteration_during_updates(self):
+        tree = create_persistent_bst_from_list(range(100))
+        snapshot = tree.snapshot()
+        seen = []
+        for node in snapshot:
+            seen.append(node.key)
+            tree.remove(node.key)
+        self.assertEqual(list(range(100)), seen)
+        self.assertEqual(0, tree.size)
+        self.assertIsNone(tree.get_root())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import pickle
+import unittest
+from math import log
+from random import Random
+
+from bst import BinarySearchTree
+from monoid import SUM
+from scapegoat_tree import ScapegoatTree
+
+
+def create_scapegoat_from_list(list_, **kwargs):
+    tree = ScapegoatTree(**kwargs)
+    for k in list_:
+        tree.insert(key=k, value=str(k))
+    return tree
+
+
+class TestScapegoatTree(unittest.TestCase):
+
+    def assert_height_bound(self, tree):
+        physical = tree.size + tree.tombstones
+        bound = log(physical) / log(1 / tree._alpha) + 2 if physical > 1 else 1
+        self.assertLessEqual(tree.get_root().height, bound)
+
+    def test_sorted_insert_stays_shallow(self):
+        tree = create_scapegoat_from_list(range(2000))
+        self.assertTrue(tree.is_valid)
+        self.assert_height_bound(tree)
+        self.assertEqual(list(range(2000)), [node.key for node in tree.inorder()])
+        self.assertEqual(2000, tree.get_root().size)
+
+    def test_lazy_remove(self):
+        tree = create_scapegoat_from_list([5, 18, 1, 8, 14, 16, 13, 3])
+        root = tree.get_root()
+        tree.remove(root.key)
+        self.assertIs(root, tree.get_root(), "remove should only mark the node as deleted")
+        self.assertEqual(1, tree.tombstones)
+        self.assertEqual(7, tree.size)
+        with self.assertRaises(KeyError):
+            tree.find(root.key)
+        with self.assertRaises(KeyError):
+            tree.remove(root.key)
+        self.assertNotIn(root.key, [node.key for node in tree.inorder()])
+        self.assertNotIn(root.key, [node.key for node in tree.preorder()])
+        self.assertEqual([None, "3"], tree.find_many([root.key, 3]))
+        self.assertEqual(sorted([1, 3, 8, 13, 14, 16, 18]), [node.key for node in tree.cursor()])
+
+    def test_remove_node_twice(self):
+        tree = create_scapegoat_from_list([5, 18, 1, 8, 14, 16, 13, 3])
+        node = tree.find(8)
+        tree.remove_node(node)
+        with self.assertRaises(KeyError):
+            tree.remove_node(node)
+        self.assertEqual(7, tree.size)
+        self.assertEqual(1, tree.tombstones)
+
+    def test_revive_tombstone(self):
+        tree = create_scapegoat_from_list([5, 3, 8])
+        tree.remove(5)
+        tree.insert(key=5, value="five")
+        self.assertEqual("five", tree[5])
+        self.assertEqual(0, tree.tombstones)
+        self.assertEqual([3, 5, 8], [node.key for node in tree.cursor()])
+
+    def test_tombstone_rebuild(self):
+        rng = Random(9)
+        keys = rng.sample(range(100000), 2000)
+        tree = create_scapegoat_from_list(keys)
+        rng.shuffle(keys)
+        for n, k in enumerate(keys[:1900]):
+            tree.remove(k)
+            self.assertLessEqual(tree.tombstones, 0.5 * (tree.size + tree.tombstones) + 1)
+        self.assertTrue(tree.is_valid)
+        self.assertEqual(100, tree.size)
+        self.assert_height_bound(tree)
+        remaining = sorted(keys[1900:])
+        self.assertEqual(remaining, [node.key for node in tree.inorder()])
+        self.assertEqual(remaining, [node.key for node in tree.cursor()])
+        self.assertEqual(remaining[0], tree.return_min_key().key)
+        self.assertEqual(remaining[-1], tree.return_max_key().key)
+        self.assertEqual(remaining[50], tree.select(50).key)
+        self.assertEqual(50, tree.rank(remaining[50]))
+        self.assertEqual(remaining[10:20], [node.key for node in tree.range_items(remaining[10], remaining[20])])
+        self.assertEqual(remaining[1], tree.cursor(remaining[0] + 1).key)
+
+    def test_remove_all(self):
+        tree = create_scapegoat_from_list(range(50))
+        for k in range(50):
+            tree.remove(k)
+        self.assertEqual(0, tree.size)
+        self.assertEqual([], list(tree.inorder()))
+        self.assertIsNone(tree.pop_min())
+
+    def test_aggregate_skips_tombstones(self):
+        tree = ScapegoatTree(monoid=SUM)
+        for k in range(200):
+            tree.insert(key=k, value=k)
+        for k in range(0, 200, 2):
+            tree.remove(k)
+        self.assertEqual(sum(range(1, 200, 2)), tree.aggregate(0, 200))
+        self.assertEqual(sum(range(51, 100, 2)), tree.aggregate(50, 100))
+        tree.insert(key=50, value=1000)
+        self.assertEqual(1000 + sum(range(51, 100, 2)), tree.aggregate(50, 100))
+        self.assertEqual(SUM, tree.split(100)[0]._monoid)
+
+    def test_get_with_bloom_filter(self):
+        tree = ScapegoatTree(bloom_error_rate=0.01)
+        for k in range(100):
+            tree.insert(key=k, value=str(k))
+        for k in range(0, 100, 2):
+            tree.remove(k)
+        self.assertEqual([None, "1", "-"], [tree.get(0), tree.get(1), tree.get(500, "-")])
+        with self.assertRaises(KeyError):
+            tree.find(2)
+        tree.insert(key=2, value="two")
+        self.assertEqual("two", tree[2])
+
+    def test_finger_survives_rebuilds(self):
+        rng = Random(11)
+        tree = ScapegoatTree(finger=True)
+        expected = {}
+        for _ in range(5000):
+            k = rng.randrange(300)
+            if k in expected:
+                tree.remove(k)
+                del expected[k]
+            else:
+                tree.insert(key=k, value=k)
+                expected[k] = k
+            probe = rng.randrange(300)
+            self.assertEqual(expected.get(probe), tree.get(probe))
+        self.assertTrue(tree.is_valid)
+        self.assertEqual(sorted(expected), [node.key for node in tree.inorder()])
+
+    def test_pickle_keeps_settings(self):
+        tree = create_scapegoat_from_list(range(100), alpha=0.6)
+        for k in range(0, 100, 3):
+            tree.remove(k)
+        clone = pickle.loads(pickle.dumps(tree))
+        self.assertIsInstance(clone, ScapegoatTree)
+        self.assertEqual(0.6, clone._alpha)
+        self.assertEqual(0, clone.tombstones)
+        self.assertEqual([node.key for node in tree.inorder()], [node.key for node in clone.inorder()])
+
+    def test_join_through_base_class(self):
+        left = create_scapegoat_from_list(range(50), alpha=0.6)
+        right = create_scapegoat_from_list(range(50, 100), alpha=0.6)
+        joined = BinarySearchTree.join(left, right)
+        self.assertIsInstance(joined, ScapegoatTree)
+        self.assertEqual(0.6, joined._alpha)
+        self.assertEqual(list(range(100)), [node.key for node in joined.inorder()])
+
+    def test_invalid_alpha(self):
+        with self.assertRaises(ValueError):
+            ScapegoatTree(alpha=0.4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from random import Random
+
+from scapegoat_tree import ScapegoatTree
+from sharded_bst import ShardedBinarySearchTree
+
+
+class TestShardedBinarySearchTree(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = ShardedBinarySearchTree(num_shards=3, chunk_size=100)
+
+    def tearDown(self):
+        self.tree.close()
+
+    def test_batches_rebalance_and_ordered_iteration(self):
+        rng = Random(12)
+        keys = rng.sample(range(-100000, 100000), 5000)
+        self.tree.insert_many((k, str(k)) for k in keys)
+        self.assertEqual(5000, len(self.tree))
+        self.assertEqual(2, len(self.tree.boundaries), "insert_many should have rebalanced the shards")
+        self.assertLessEqual(max(self.tree._sizes), 2 * 5000 / 3)
+        probes = keys[:100] + [200001, -200001]
+        self.assertEqual([str(k) for k in keys[:100]] + ["-", "-"], self.tree.find_many(probes, default="-"))
+        self.assertEqual(sorted(keys), [key for key, _ in self.tree.items()])
+        self.assertEqual(sorted(keys)[:3], [node.key for node in self.tree][:3])
+
+        for k in keys[:2500]:
+            self.tree.remove(k)
+        self.tree.rebalance()
+        actual_sizes = [size for _, size in self.tree._scatter('size', {shard: () for shard in range(3)})]
+        self.assertEqual(self.tree._sizes, actual_sizes)
+        self.assertEqual(2500, sum(actual_sizes))
+        self.assertEqual(sorted(keys[2500:]), [key for key, _ in self.tree.items()])
+        self.assertEqual(str(keys[2600]), self.tree[keys[2600]])
+        self.assertIsNone(self.tree.get(keys[0]))
+
+    def test_two_shards_rebalance_automatically(self):
+        with ShardedBinarySearchTree(num_shards=2) as tree:
+            for k in range(5000):
+                tree.insert(key=k, value=k)
+            self.assertEqual(1, len(tree.boundaries))
+            self.assertLessEqual(max(tree._sizes), 0.75 * 5000)
+            self.assertEqual(list(range(5000)), [key for key, _ in tree.items()])
+
+    def test_rebalance_with_few_keys(self):
+        self.tree.insert(key=-7, value="a")
+        self.tree.rebalance()
+        self.assertEqual([-7, -7], self.tree.boundaries)
+        self.tree.insert(key=-9, value="b")
+        self.assertEqual([1, 0, 1], self.tree._sizes)
+        self.assertEqual([(-9, "b"), (-7, "a")], list(self.tree.items()))
+        with ShardedBinarySearchTree(num_shards=3) as tree:
+            tree.insert(key="m", value=1)
+            tree.rebalance()
+            self.assertEqual(["m", "m"], tree.boundaries)
+            self.assertEqual(1, tree["m"])
+
+    def test_errors_from_workers(self):
+        self.tree.insert(key=5, value="5")
+        with self.assertRaises(KeyError):
+            self.tree.insert(key=5, value="five")
+        with self.assertRaises(KeyError):
+            self.tree.find(6)
+        with self.assertRaises(KeyError):
+            self.tree.remove(6)
+        with self.assertRaises(KeyError):
+            self.tree.insert_many([(5, "a"), (7, "7")])
+        self.assertEqual("7", self.tree[7])
+        self.assertEqual(2, self.tree.size)
+        with self.assertRaises(ValueError):
+            self.tree.find(None)
+
+    def test_tree_class_and_settings(self):
+        with ShardedBinarySearchTree(num_shards=2, tree_class=ScapegoatTree, bloom_error_rate=0.01) as tree:
+            tree.insert_many((k, k) for k in range(3000))
+            self.assertEqual(list(range(3000)), [key for key, _ in tree.items()])
+            self.assertEqual([2999, None], tree.find_many([2999, 3000]))
+
+
+if __name__ == "__main__":
+    unittest.main()
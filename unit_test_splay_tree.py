@@ -0,0 +1,75 @@
+import unittest
+from random import Random
+
+from splay_tree import SplayTree
+
+
+def create_splay_from_list(list_):
+    tree = SplayTree()
+    for k in list_:
+        tree.insert(key=k, value=str(k))
+    return tree
+
+
+class TestSplayTree(unittest.TestCase):
+
+    def test_accessed_node_becomes_root(self):
+        tree = create_splay_from_list([5, 18, 1, 8, 14, 16, 13, 3])
+        self.assertEqual(3, tree.get_root().key)
+        self.assertEqual("8", tree[8])
+        self.assertEqual(8, tree.get_root().key)
+        self.assertIsNone(tree.get_root().parent)
+        with self.assertRaises(KeyError):
+            tree.find(15)
+        self.assertIn(tree.get_root().key, (14, 16))
+        self.assertTrue(tree.is_valid)
+
+    def test_random_operations(self):
+        rng = Random(5)
+        keys = rng.sample(range(100000), 2000)
+        tree = create_splay_from_list(keys)
+        for _ in range(2000):
+            k = rng.choice(keys)
+            self.assertEqual(str(k), tree[k])
+        for k in keys[:1500]:
+            tree.remove(k)
+        self.assertTrue(tree.is_valid)
+        self.assertEqual(500, tree.size)
+        self.assertEqual(sorted(keys[1500:]), [node.key for node in tree.inorder()])
+        self.assertEqual(500, tree.get_root().size)
+        self.assertEqual(sorted(keys[1500:]), [node.key for node in tree.cursor()])
+        self.assertEqual(min(keys[1500:]), tree.return_min_key().key)
+
+    def test_repeated_access_is_cheap(self):
+        tree = create_splay_from_list(range(1000))
+        tree.enable_instrumentation()
+        tree.find(500)
+        tree.reset_counters()
+        tree.find(500)
+        self.assertEqual(1, tree.counters()['node_visits'])
+
+    def test_bloom_filter_and_get(self):
+        tree = SplayTree(bloom_error_rate=0.001)
+        for k in range(0, 1000, 2):
+            tree.insert(key=k, value=str(k))
+        tree.remove(500)
+        root = tree.get_root()
+        misses = [k for k in range(1, 1000, 2) if tree.get(k, "-") == "-"]
+        self.assertEqual(500, len(misses))
+        self.assertIs(root, tree.get_root(), "Bloom filter misses should not touch the tree")
+        self.assertEqual("-", tree.get(500, "-"))
+        self.assertEqual("42", tree.get(42))
+        self.assertEqual(42, tree.get_root().key)
+        with self.assertRaises(KeyError):
+            tree.find(7)
+        self.assertTrue(tree.is_valid)
+
+    def test_remove_non_existing_key(self):
+        tree = create_splay_from_list(range(10))
+        with self.assertRaises(KeyError):
+            tree.remove(20)
+        self.assertEqual(10, tree.size)
+
+
+if __name__ == "__main__":
+    unittest.main()